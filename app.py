@@ -1,508 +1,564 @@
-import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-import time
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Set page configuration
-st.set_page_config(page_title="Sales Dashboard", page_icon=":bar_chart:", layout="wide")
-
-# Function to load dataset
-@st.cache_data
-def load_data(file_url):
-    return pd.read_csv(file_url)
-
-# Load dataset from a public URL (replace with your hosted file URL)
-file_url = "https://path_to_your_file.csv"  # Replace this with the actual file URL
-
-# Display spinner while loading app
-with st.spinner('Loading app...'):
-    time.sleep(1)
-
-# Load the data from the cloud
-df = load_data("https://drive.google.com/uc?export=download&id=1wuElVDAP8erlGjsXkq_fPGCPLrtsljQY")
-
-# Main dashboard title
-st.markdown(
-    """
-    <div style='text-align: center;'>
-        <h1 style='font-size: 3.5em; font-family: "Arial", sans-serif; font-weight: 700; color: #71C6FF;'>Supply Chain Dashboard</h1>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
-
-# Dataset display expander
-with st.expander("📋 Show Dataset"):
-    st.write(df)
-
-
-# Sidebar filters
-product_types = st.sidebar.multiselect("Select Product Type(s)", options=df['Product type'].unique(), default=df['Product type'].unique())
-df = df[df['Product type'].isin(product_types)]
-
-search_term = st.sidebar.text_input("Search Product/Order ID")
-if search_term:
-    df = df[df['Product Name'].str.contains(search_term, case=False)]
-
-# Filter for Manufacturing Costs (Range Slider)
-min_cost, max_cost = st.sidebar.slider(
-    "Select Manufacturing Cost Range:",
-    min_value=int(df['Manufacturing costs'].min()), 
-    max_value=int(df['Manufacturing costs'].max()),
-    value=(int(df['Manufacturing costs'].min()), int(df['Manufacturing costs'].max()))
-)
-df = df[(df['Manufacturing costs'] >= min_cost) & (df['Manufacturing costs'] <= max_cost)]
-
-# Additional Filters
-# Filter for Order Quantities
-min_quantity, max_quantity = st.sidebar.slider(
-    "Select Order Quantity Range:",
-    min_value=int(df['Order quantities'].min()), 
-    max_value=int(df['Order quantities'].max()),
-    value=(int(df['Order quantities'].min()), int(df['Order quantities'].max()))
-)
-df = df[(df['Order quantities'] >= min_quantity) & (df['Order quantities'] <= max_quantity)]
-
-# Filter for Inspection Results
-inspection_results_filter = st.sidebar.multiselect(
-    "Select Inspection Results:", options=df['Inspection results'].unique(),
-    default=df['Inspection results'].unique()
-)
-df = df[df['Inspection results'].isin(inspection_results_filter)]
-
-# Filter for Locations
-location_filter = st.sidebar.multiselect(
-    "Select Locations:", options=df['Location'].unique(),
-    default=df['Location'].unique()
-)
-df = df[df['Location'].isin(location_filter)]
-
-# Filter for Transportation Modes
-transportation_modes_filter = st.sidebar.multiselect(
-    "Select Transportation Modes:", options=df['Transportation modes'].unique(),
-    default=df['Transportation modes'].unique()
-)
-df = df[df['Transportation modes'].isin(transportation_modes_filter)]
-
-# Display cards for KPIs
-card_container = st.container()
-with card_container:
-    col1, col2, col3 = st.columns(3, gap="large")
-
-    # Card: Total Revenue Generated
-    with col1:
-        if 'Revenue generated' in df.columns:
-            total_revenue = df['Revenue generated'].sum()
-            st.markdown(
-                f"""
-                <div style="background-color: #f0f2f6; border-radius: 10px; padding: 20px; text-align: center; box-shadow: 0px 4px 6px rgba(0, 0, 0, 0.1);">
-                    <h2 style="font-size: 24px; color: #333;">💰 Total Revenue Generated</h2>
-                    <h1 style="font-size: 36px; color: #2b8c42;">₹{total_revenue:,.2f}</h1>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-        else:
-            st.warning("The 'Revenue generated' column is missing.")
-
-    # Card: Total Order Quantity
-    with col2:
-        if 'Order quantities' in df.columns:
-            total_order_quantity = df['Order quantities'].sum()
-            st.markdown(
-                f"""
-                <div style="background-color: #f0f2f6; border-radius: 10px; padding: 20px; text-align: center; box-shadow: 0px 4px 6px rgba(0, 0, 0, 0.1);">
-                    <h2 style="font-size: 24px; color: #333;">📦 Total Order Quantity</h2>
-                    <h1 style="font-size: 36px; color: #2b8c42;">{total_order_quantity:,}</h1>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-        else:
-            st.warning("The 'Order quantities' column is missing.")
-
-    # Card: Total Availability
-    with col3:
-        if 'Stock levels' in df.columns:
-            total_availability = df['Stock levels'].sum()
-            st.markdown(
-                f"""
-                <div style="background-color: #f0f2f6; border-radius: 10px; padding: 20px; text-align: center; box-shadow: 0px 4px 6px rgba(0, 0, 0, 0.1);">
-                    <h2 style="font-size: 24px; color: #333;">📊 Total Availability</h2>
-                    <h1 style="font-size: 36px; color: #2b8c42;">{total_availability:,}</h1>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-        else:
-            st.warning("The 'Stock levels' column is missing.")
-
-# Add space above the collapsible section
-st.markdown("<br><br>", unsafe_allow_html=True)  # Adds space above the summary
-# Display the dataset and summary text
-with st.expander("📋 Show Summary"):
-    st.write("""
-    ### Supply Chain Summary
-
-    #### 1. Overall Business Performance (KPIs)
-    - The business has achieved **total revenue** of **₹577,604.82**, showcasing a robust financial performance.
-    - **Order volumes** remain strong with a cumulative **4,922 orders**, reflecting sustained demand.
-    - Product **availability levels** are healthy at **4,840 units**, ensuring readiness to meet market needs.
-
-    #### 2. Operational Efficiency (Gauges)
-    - **Stock levels** are maintained at a commendable **4,777 units**, ensuring smooth operations without overstocking.
-    - **Lead times** average at **15.96 days**, indicating room for improvement to enhance customer satisfaction.
-
-    #### 3. Product Performance
-    - **Revenue by Product Type:**
-        - **Skincare** is the top performer, generating **₹241,628.16** in revenue.
-        - **Haircare** follows with **₹174,455.39**, while **Cosmetics** contribute **₹161,521.27**.
-    - **Price vs. Cost with Profit Margins:**
-        - **Cosmetics** lead profitability with an average margin of **₹14.31 per unit.**
-        - **Haircare** and **Skincare** show slight losses, with margins of **- ₹2.44** and **- ₹1.73**, respectively, suggesting cost optimization opportunities.
-
-    #### 4. Regional and Logistic Trends
-    - **Revenue by Location:**
-        - Mumbai and Kolkata emerge as the top contributors, earning **₹137,755.03** and **₹137,077.55**, respectively.
-        - Bangalore, Chennai, and Delhi perform moderately, generating revenues between **₹81,027** and **₹119,143**.
-    - **Order Quantities by Location:**
-        - Highest orders come from **Kolkata (1,228)** and **Chennai (1,109)**, highlighting strong regional demand.
-        - **Bangalore (769)** and **Delhi (733)** present opportunities for growth.
-    - **Transportation Modes:**
-        - **Road (1,386 orders)** and **Rail (1,342 orders)** dominate as the preferred transportation methods.
-        - **Air (1,341 orders)** offers efficiency but might involve higher costs, while **Sea (853 orders)** has the lowest usage.
-
-    #### 5. Cost Management and Quality Control
-    - **Manufacturing Costs by Inspection Results:**
-        - **Pending inspections** account for the largest costs (**₹1,785.07**), highlighting a need for process acceleration.
-        - **Failed inspections** contribute **₹1,880.30**, pointing to quality assurance gaps.
-    - **Cost by Supplier:**
-        - **Supplier 1 (₹1,221.86)** and **Supplier 4 (₹1,128.78)** handle the bulk of costs, suggesting potential high-value partnerships.
-        - **Supplier 3 (₹654.51)** incurs the least costs, indicating efficient operations.
-
-    #### 6. Insights on Revenue vs. Costs
-    - **Manufacturing Costs and Revenue Relationship:**
-        - Higher revenues correlate with moderate manufacturing costs, with outliers at both extremes.
-        - Balancing cost control and revenue generation remains critical for profitability.
-    """)
-
-# Create two columns for the two gauges side by side
-gauge_col1, gauge_col2 = st.columns(2)
-
-# Plot 1: Total Stock Levels
-if 'Stock levels' in df.columns:
-    total_stock_levels = df['Stock levels'].sum()
-
-    fig_stock_levels = go.Figure(go.Indicator(
-        mode="number+gauge",
-        value=total_stock_levels,
-        gauge={
-            'axis': {'range': [0, total_stock_levels * 1.2]},
-            'bar': {'color': "rgba(31, 119, 180, 0.8)"},
-            'steps': [
-                {'range': [0, total_stock_levels / 2], 'color': "lightgray"},
-                {'range': [total_stock_levels / 2, total_stock_levels], 'color': "gray"}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': total_stock_levels
-            }
-        }
-    ))
-
-    fig_stock_levels.update_layout(
-        title={'text': "Current Stock Levels", 'font': {'size': 20}},
-        font=dict(size=18, color='white'),
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        paper_bgcolor='rgba(0, 0, 0, 0)',
-    )
-
-    gauge_col1.plotly_chart(fig_stock_levels, key="stock_levels_chart")
-else:
-    gauge_col1.warning("The 'Stock levels' column is missing.")
-
-# Plot 2: Total Lead Times
-if 'Lead times' in df.columns:
-    total_lead_times = df['Lead times'].sum()
-
-    fig_lead_times = go.Figure(go.Indicator(
-        mode="number+gauge",
-        value=total_lead_times,
-        gauge={
-            'axis': {'range': [0, total_lead_times * 1.2]},
-            'bar': {'color': "rgba(180, 119, 31, 0.8)"},
-            'steps': [
-                {'range': [0, total_lead_times / 2], 'color': "lightgray"},
-                {'range': [total_lead_times / 2, total_lead_times], 'color': "gray"}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': total_lead_times
-            }
-        }
-    ))
-
-    fig_lead_times.update_layout(
-        title={'text': "Current Lead Times", 'font': {'size': 20}},
-        font=dict(size=18, color='white'),
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        paper_bgcolor='rgba(0, 0, 0, 0)',
-    )
-
-    gauge_col2.plotly_chart(fig_lead_times, key="lead_times_chart")
-else:
-    gauge_col2.warning("The 'Lead times' column is missing.")
-
-# New Row for Revenue and Manufacturing Costs
-col1, col2 = st.columns(2)
-
-# Plot: Relationship between Manufacturing Costs and Revenue Generated
-with col1:
-    if 'Manufacturing costs' in df.columns and 'Revenue generated' in df.columns:
-        fig_relationship = px.scatter(
-            df,
-            x='Manufacturing costs',
-            y='Revenue generated',
-            title='Relationship between Manufacturing Costs and Revenue Generated',
-            labels={
-                'Manufacturing costs': 'Manufacturing Costs ($)',
-                'Revenue generated': 'Revenue Generated ($)'
-            },
-            color='Product type' if 'Product type' in df.columns else None,
-            size='Revenue generated',
-            hover_data=['Product type'] if 'Product type' in df.columns else None
-        )
-
-        fig_relationship.update_layout(
-            xaxis_title="Manufacturing Costs ($)",
-            yaxis_title="Revenue Generated ($)",
-            font=dict(size=14, color='white'),
-            plot_bgcolor='rgba(0, 0, 0, 0)',
-            paper_bgcolor='rgba(0, 0, 0, 0)'
-        )
-
-        fig_relationship.update_traces(marker=dict(opacity=0.8))
-
-        col1.plotly_chart(fig_relationship)
-    else:
-        col1.warning("The 'Manufacturing costs' or 'Revenue generated' columns are missing.")
-
-# Plot: Revenue Generated by Product Type
-with col2:
-    if 'Product type' in df.columns and 'Revenue generated' in df.columns:
-        revenue_by_product = df.groupby('Product type').agg({'Revenue generated': 'sum'}).reset_index()
-        fig_revenue_product = px.bar(
-            revenue_by_product,
-            x='Product type',
-            y='Revenue generated',
-            title='Revenue Generated by Product Type',
-            labels={'Revenue generated': 'Total Revenue ($)', 'Product type': 'Product Type'}
-        )
-
-        fig_revenue_product.update_layout(
-            xaxis_title="Product Type",
-            yaxis_title="Total Revenue ($)",
-            yaxis_tickprefix="$",
-            yaxis_tickformat=".2f",
-            margin=dict(l=40, r=40, t=40, b=40),
-            font=dict(size=14, color='white'),
-            plot_bgcolor='rgba(0, 0, 0, 0)',
-            paper_bgcolor='rgba(0, 0, 0, 0)',
-            bargap=0,
-            bargroupgap=0.1
-        )
-
-        fig_revenue_product.update_traces(marker=dict(color=['#813cf6', '#15abbd', '#df9def']))
-
-        col2.plotly_chart(fig_revenue_product)
-    else:
-        col2.warning("The 'Product type' or 'Revenue generated' columns are missing.")
-
-
-# Add Profit Margin Percentage column
-df['Profit Margin (%)'] = ((df['Price'] - df['Manufacturing costs']) / df['Price']) * 100
-
-# Create a layout with three columns
-col1, col2, col3 = st.columns(3)
-
-# Visualization 1: Revenue Distribution by Location (Pie Chart)
-with col1:
-    if 'Revenue generated' in df.columns and 'Location' in df.columns:
-        fig1, ax1 = plt.subplots()
-
-        custom_colors = ['#d62728', '#e33bc2', '#ff7f0e', '#1f77b4', '#2ca02c']  # Example custom colors
-        ax1.pie(
-            df.groupby('Location')['Revenue generated'].sum(),
-            labels=df['Location'].unique(),
-            autopct='%1.1f%%',
-            colors=custom_colors[:len(df['Location'].unique())],
-            textprops={'fontsize': 12, 'color': 'white'}
-        )
-        ax1.set_title("Revenue by Location", fontsize=16, color='white')
-        fig1.patch.set_facecolor((0, 0, 0, 0))
-        ax1.set_facecolor((0, 0, 0, 0))
-        st.pyplot(fig1)
-    else:
-        st.warning("Required columns ('Revenue generated', 'Location') are missing.")
-
-# Visualization 2: Distribution of Manufacturing Cost by Supplier (Pie Chart)
-with col2:
-    if 'Manufacturing costs' in df.columns and 'Supplier name' in df.columns:
-        fig2, ax2 = plt.subplots()
-        colors = sns.color_palette('Set2', len(df['Supplier name'].unique()))
-        ax2.pie(
-            df.groupby('Supplier name')['Manufacturing costs'].sum(),
-            labels=df['Supplier name'].unique(),
-            autopct='%1.1f%%',
-            colors=colors,
-            textprops={'fontsize': 12, 'color': 'white'}
-        )
-        ax2.set_title("Manufacturing Costs by Supplier", fontsize=16, color='white')
-        fig2.patch.set_facecolor((0, 0, 0, 0))
-        ax2.set_facecolor((0, 0, 0, 0))
-        st.pyplot(fig2)
-    else:
-        st.warning("Required columns ('Manufacturing costs', 'Supplier name') are missing.")
-# Visualization 3: Comparison of Price and Manufacturing Cost by Product Type (Bar Graph with Profit Margin)
-# Visualization 3: Comparison of Price and Manufacturing Cost by Product Type (Bar Graph with Profit Margin)
-with col3:
-    if 'Price' in df.columns and 'Manufacturing costs' in df.columns and 'Product type' in df.columns:
-        fig3, ax3 = plt.subplots(figsize=(6, 4))
-        bar_width = 0.35
-        product_types = df['Product type'].unique()
-        x = range(len(product_types))
-
-        # Calculate mean price, manufacturing cost, and profit margin
-        price_aggregated = df.groupby('Product type')['Price'].mean()
-        manufacturing_cost_aggregated = df.groupby('Product type')['Manufacturing costs'].mean()
-        profit_margins = ((price_aggregated - manufacturing_cost_aggregated) / price_aggregated * 100).round(2)
-
-        # Create bar chart for price and manufacturing cost
-        ax3.bar(x, price_aggregated, width=bar_width, label='Price', color='blue')
-        ax3.bar([i + bar_width for i in x], manufacturing_cost_aggregated, width=bar_width, label='Manufacturing Cost', color='orange')
-
-        # Add profit margin text above the bars
-        for i, profit in enumerate(profit_margins):
-            ax3.text(i + bar_width / 2, price_aggregated[i] + 10, f'{profit:.1f}%', ha='center', fontsize=10, color='white')
-
-        # Set x-axis labels and make them visible in white
-        ax3.set_xticks([i + bar_width / 2 for i in x])
-        ax3.set_xticklabels(product_types, rotation=45, fontsize=12, color='white')
-        ax3.set_xlabel("Product Type", fontsize=14, color='white')
-        ax3.set_ylabel("Cost / Price", fontsize=14, color='white')
-
-        # Adjust the legend location and make it white
-        ax3.legend(loc='upper left', fontsize=10, frameon=False, facecolor='black', edgecolor='white', labelcolor='white')
-    
-        # Remove gridlines and adjust background color for visibility
-        ax3.grid(False)
-        fig3.patch.set_facecolor((0, 0, 0, 0))
-        ax3.set_facecolor((0, 0, 0, 0))
-        
-        # Make all text (axis values, labels) white
-        for tick in ax3.get_xticklabels() + ax3.get_yticklabels():
-            tick.set_color('white')
-
-        st.pyplot(fig3)
-    else:
-        st.warning("Required columns ('Price', 'Manufacturing costs', 'Product type') are missing.")
-
-# Adjusted layout with 3 visuals in 1 row for other visualizations
-col1, col2, col3 = st.columns(3)  # Create 3 columns for side-by-side layout
-
-# Plot 5: Manufacturing Costs by Inspection Results in col1
-with col1:
-    if 'Inspection results' in df.columns and 'Manufacturing costs' in df.columns:
-        cost_summary = df.groupby('Inspection results').agg({'Manufacturing costs': 'sum'}).reset_index()
-
-        total_costs = cost_summary['Manufacturing costs'].sum()
-
-        cost_summary['Percentage Contribution'] = (cost_summary['Manufacturing costs'] / total_costs * 100).round(2)
-
-        cost_summary['Manufacturing costs'] = cost_summary['Manufacturing costs'].astype(float).round(2)
-        cost_summary['Percentage Contribution'] = cost_summary['Percentage Contribution'].astype(float).round(2)
-
-        cost_summary = cost_summary.sort_values(by='Manufacturing costs', ascending=False)
-
-        fig = px.pie(
-            cost_summary,
-            names='Inspection results',
-            values='Manufacturing costs',
-            title='Manufacturing Costs by Inspection Results',
-            color_discrete_sequence=px.colors.sequential.Plasma  # Updated color scheme
-        )
-
-        fig.update_traces(
-            hoverinfo='label+value+percent',
-            textinfo='value+percent'
-        )
-
-        fig.update_layout(
-            font=dict(size=14, color='white'),
-            showlegend=True,
-            legend_title_text='Inspection Results',
-            plot_bgcolor='rgba(0, 0, 0, 0)',
-            paper_bgcolor='rgba(0, 0, 0, 0)',
-        )
-
-        st.plotly_chart(fig, key="cost_inspection_results")  # Add a unique key
-    else:
-        st.warning("The 'Inspection results' or 'Manufacturing costs' columns are missing.")
-
-# Plot 6: Order Quantities by Location in col2
-with col2:
-    if 'Location' in df.columns and 'Order quantities' in df.columns:
-        result = df.groupby('Location')['Order quantities'].sum().reset_index()
-
-        result = result.sort_values(by='Order quantities', ascending=False)
-
-        fig = px.bar(result, x='Location', y='Order quantities',
-                     title='Order Quantities by Location',
-                     labels={'Location': 'Location', 'Order quantities': 'Total Order Quantities'},
-                     color='Location',
-                     color_discrete_sequence=px.colors.qualitative.Set1,  # Updated color scheme
-                    )
-
-        fig.update_layout(
-            xaxis_title="Location",
-            yaxis_title="Total Order Quantities",
-            font=dict(size=14, color='white'),
-            plot_bgcolor='rgba(0, 0, 0, 0)',
-            paper_bgcolor='rgba(0, 0, 0, 0)',
-            bargap=0.1,
-        )
-
-        st.plotly_chart(fig, key="order_quantities_location")  # Add a unique key
-
-# Total Order Quantities by Transportation Mode in col3
-with col3:
-    if 'Transportation modes' in df.columns and 'Order quantities' in df.columns:
-        transport_data = df.groupby('Transportation modes')['Order quantities'].sum().reset_index()
-        
-        # Update the color_discrete_sequence to navy blue to light blue
-        fig_transport = px.pie(
-            transport_data,
-            names='Transportation modes',
-            values='Order quantities',
-            title='Order Quantities by Transportation Mode',
-            color_discrete_sequence=['#003366', '#3366CC', '#66CCFF']  # Navy blue to light blue color gradient
-        )
-        
-        fig_transport.update_traces(textinfo='percent+label')
-        fig_transport.update_layout(
-            font=dict(size=14, color='white'),
-            showlegend=True,
-            plot_bgcolor='rgba(0, 0, 0, 0)',
-            paper_bgcolor='rgba(0, 0, 0, 0)',
-        )
-        
-        st.plotly_chart(fig_transport, key="order_quantities_transportation_mode")  # Add a unique key
-
-    else:
-        st.warning("The 'Transportation modes' or 'Order quantities' columns are missing.")
-
+import math
+import os
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from dashboard import charts, forecast, logistics, pipeline, streaming
+from dashboard.figcache import FigureCache
+from dashboard.filters import FilterIndex, Query
+from dashboard.grid import DataGrid
+from dashboard.ingest import DatasetStore
+from dashboard.metrics import MetricsRegistry, RunMetrics
+from dashboard.panels import PanelRun
+from dashboard.schema import memory_report
+from dashboard.search import SearchIndex
+from dashboard.sources import DEFAULT_SOURCE, load_dataset
+from dashboard.views import MaterializedViews, summary_markdown, views_path
+
+# Set page configuration
+st.set_page_config(page_title="Sales Dashboard", page_icon=":bar_chart:", layout="wide")
+
+# Local data source: the bundled CSV by default, or any Parquet/Feather/Arrow file
+DATA_SOURCE = os.environ.get("DASHBOARD_DATA", DEFAULT_SOURCE)
+
+# Sessions share one read-only dataset; copy-on-write (always on from pandas 3)
+# keeps any accidental mutation private to the session that made it
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Per-rerun stage timings; totals are exported as JSONL (DASHBOARD_METRICS_LOG)
+# and/or a Prometheus text file (DASHBOARD_METRICS_PROM)
+@st.cache_resource
+def load_metrics_registry():
+    return MetricsRegistry(os.environ.get("DASHBOARD_METRICS_LOG"), os.environ.get("DASHBOARD_METRICS_PROM"))
+
+metrics_registry = load_metrics_registry()
+script_context = get_script_run_ctx()
+run_metrics = RunMetrics(
+    session_id=script_context.session_id if script_context else None,
+    trace_memory=st.session_state.get('trace_memory', os.environ.get("DASHBOARD_TRACE_MEMORY") == "1"),
+)
+
+# Fast start (DASHBOARD_FAST_START=1): the dataset table and the chart rows
+# below the gauges are only built once their expanders are opened, so a
+# rerun paints the KPI cards and gauges without waiting on them
+FAST_START = os.environ.get("DASHBOARD_FAST_START") == "1"
+EXPANDER_MODE = 'rerun' if FAST_START else 'ignore'
+
+# Process-wide store holding the one copy of the dataset every session reads
+# (text sources are snapshotted to a typed columnar file on first load);
+# rows dropped into DASHBOARD_DROP_DIR are merged in by SKU
+DROP_DIR = os.environ.get("DASHBOARD_DROP_DIR")
+DROP_POLL_SECONDS = float(os.environ.get("DASHBOARD_DROP_POLL_SECONDS", "5"))
+
+# Indexes kept per data version: built on first use, then rebuilt in the
+# background for every new version before it is published
+STORE_INDEXES = {
+    'filter': FilterIndex,  # category bitmaps + sorted numeric columns
+    'search': SearchIndex,  # n-gram index over the identifier columns
+    'forecast': forecast.sku_forecast,  # per-SKU stock-out forecast
+    'grid': DataGrid,  # sort orders for the paged dataset table
+}
+
+@st.cache_resource(on_release=lambda store: store.stop())
+def load_store(source):
+    store = DatasetStore(load_dataset(source), views_path=views_path(source), indexes=STORE_INDEXES)
+    if DROP_DIR:
+        store.watch(DROP_DIR, DROP_POLL_SECONDS)
+    return store
+
+# Out-of-core mode (DASHBOARD_STREAMING=1) for sources larger than memory:
+# nothing is loaded up front; each filter state streams the source once
+STREAMING = os.environ.get("DASHBOARD_STREAMING") == "1"
+
+# Filter options, slider bounds and a preview of a streamed source
+@st.cache_resource(max_entries=2)
+def load_domain(source, version):
+    return streaming.SourceDomain(source)
+
+# Load the data from the local store
+with run_metrics.stage('load') as stage:
+    if STREAMING:
+        data_version = streaming.source_version(DATA_SOURCE)
+        domain = load_domain(DATA_SOURCE, data_version)
+        stage['rows_out'] = domain.n_rows
+    else:
+        store = load_store(DATA_SOURCE)
+        snapshot = store.snapshot()
+        data_version = snapshot.version
+        df = snapshot.data
+        stage['rows_out'] = len(df)
+
+# Built figures shared across sessions, keyed by their inputs
+FIGURE_CACHE_SIZE = int(os.environ.get("DASHBOARD_FIGURE_CACHE_SIZE", "256"))
+
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache(FIGURE_CACHE_SIZE)
+
+figure_cache = load_figure_cache()
+
+# Main dashboard title
+st.markdown(
+    """
+    <div style='text-align: center;'>
+        <h1 style='font-size: 3.5em; font-family: "Arial", sans-serif; font-weight: 700; color: #71C6FF;'>Supply Chain Dashboard</h1>
+    </div>
+    """,
+    unsafe_allow_html=True
+)
+
+# Dataset display expander
+dataset_expander = st.expander("📋 Show Dataset", key='show_dataset', on_change=EXPANDER_MODE)
+with dataset_expander:
+    if dataset_expander.open is False:
+        pass  # collapsed in fast-start mode: don't serialize the table
+    elif STREAMING:
+        st.caption(f"Streaming mode: first {len(domain.preview):,} of {domain.n_rows:,} rows")
+        st.write(domain.preview)
+    # In-memory mode fills the expander with a paged grid once the selection is known
+
+
+if not STREAMING:
+    with run_metrics.stage('index', rows_in=len(df)):
+        filter_index = snapshot.index('filter')
+    domain = filter_index
+    if DROP_DIR:
+        st.sidebar.caption(f"Data version {snapshot.version} · {len(df):,} rows")
+        for path, error in store.failures.items():
+            st.sidebar.warning(f"Skipped {os.path.basename(path)}: {error}")
+
+# Range slider bounds covering the whole column
+def slider_bounds(column):
+    low, high = domain.bounds[column]
+    return int(math.floor(low)), int(math.ceil(high))
+
+# Sidebar filters (options come from the full dataset, so widgets don't depend on each other)
+product_types = st.sidebar.multiselect("Select Product Type(s)", options=domain.options['Product type'], default=domain.options['Product type'])
+
+search_term = st.sidebar.text_input("Search SKU / Supplier / Carrier / Route")
+
+# Filter for Manufacturing Costs (Range Slider)
+cost_bounds = slider_bounds('Manufacturing costs')
+min_cost, max_cost = st.sidebar.slider(
+    "Select Manufacturing Cost Range:",
+    min_value=cost_bounds[0],
+    max_value=cost_bounds[1],
+    value=cost_bounds
+)
+
+# Additional Filters
+# Filter for Order Quantities
+quantity_bounds = slider_bounds('Order quantities')
+min_quantity, max_quantity = st.sidebar.slider(
+    "Select Order Quantity Range:",
+    min_value=quantity_bounds[0],
+    max_value=quantity_bounds[1],
+    value=quantity_bounds
+)
+
+# Filter for Inspection Results
+inspection_results_filter = st.sidebar.multiselect(
+    "Select Inspection Results:", options=domain.options['Inspection results'],
+    default=domain.options['Inspection results']
+)
+
+# Filter for Locations
+location_filter = st.sidebar.multiselect(
+    "Select Locations:", options=domain.options['Location'],
+    default=domain.options['Location']
+)
+
+# Filter for Transportation Modes
+transportation_modes_filter = st.sidebar.multiselect(
+    "Select Transportation Modes:", options=domain.options['Transportation modes'],
+    default=domain.options['Transportation modes']
+)
+
+# Large-data mode for the costs vs revenue scatter (above SCATTER_MAX_POINTS rows)
+SCATTER_MAX_POINTS = int(os.environ.get("DASHBOARD_SCATTER_MAX_POINTS", "5000"))
+scatter_mode = st.sidebar.radio(
+    "Scatter mode for large selections:", options=['sample', 'density'],
+    format_func={'sample': "Sampled points", 'density': "Density heatmap"}.get,
+    horizontal=True,
+)
+
+# Evaluate all filters in one pass and materialize the selection once
+query = Query.from_widgets(
+    categories={
+        'Product type': product_types,
+        'Inspection results': inspection_results_filter,
+        'Location': location_filter,
+        'Transportation modes': transportation_modes_filter,
+    },
+    ranges={
+        'Manufacturing costs': (min_cost, max_cost),
+        'Order quantities': (min_quantity, max_quantity),
+    },
+)
+# Aggregation cube behind every KPI card and chart, one scan per filter state;
+# the unfiltered cube is the store's running aggregate
+@st.cache_resource(max_entries=64)
+def load_filtered_cube(source, version, query, search_term, _layout, _data, _rows):
+    return _layout.aggregate(_data, _rows)
+
+# Streaming mode: filter and aggregate in one pass over the source; the
+# selection is represented by the cube plus a bounded sample of its rows
+@st.cache_resource(max_entries=16)
+def load_stream(source, version, query, search_term, sample_size, _domain):
+    return streaming.stream_query(source, query, search_term, _domain, sample_size)
+
+if STREAMING:
+    with run_metrics.stage('stream', rows_in=domain.n_rows) as stage:
+        stream = load_stream(DATA_SOURCE, data_version, query, search_term, SCATTER_MAX_POINTS, domain)
+        cube, df = stream.cube, stream.sample
+        rows = np.arange(len(df))
+        stage['rows_out'] = stream.n_rows
+else:
+    with run_metrics.stage('filter', rows_in=len(df)) as stage:
+        search_rows = snapshot.index('search').search(search_term) if search_term.strip() else None
+        rows = filter_index.evaluate(query, row_set=search_rows)
+        stage['rows_out'] = len(rows)
+
+    with run_metrics.stage('aggregate', rows_in=len(rows)) as stage:
+        if len(rows) == len(df):
+            cube = snapshot.cube
+        else:
+            cube = load_filtered_cube(DATA_SOURCE, snapshot.version, query, search_term, snapshot.layout, df, rows)
+        stage['rows_out'] = len(cube.cells)
+
+# Server-side paged dataset table: sorting, filtering and column selection
+# happen here, and only the visible page of the chosen columns is sent
+GRID_PAGE_SIZES = [25, 50, 100, 500]
+GRID_DEFAULT_COLUMNS = 8
+
+if not STREAMING and dataset_expander.open is not False:
+    with dataset_expander:
+        grid_col1, grid_col2, grid_col3, grid_col4 = st.columns([4, 2, 1, 1])
+        grid_columns = grid_col1.multiselect(
+            "Columns:", list(df.columns), default=list(df.columns[:GRID_DEFAULT_COLUMNS]), key='grid_columns'
+        )
+        grid_sort = grid_col2.selectbox("Sort by:", ["(none)"] + list(df.columns), key='grid_sort')
+        grid_descending = grid_col2.toggle("Descending", key='grid_descending')
+        grid_page_size = grid_col3.selectbox("Rows per page:", GRID_PAGE_SIZES, index=1, key='grid_page_size')
+        n_pages = max(1, math.ceil(len(rows) / grid_page_size))
+        if st.session_state.get('grid_page', 1) > n_pages:
+            st.session_state['grid_page'] = n_pages  # the selection or page size shrank
+        grid_page = int(grid_col4.number_input("Page:", min_value=1, max_value=n_pages, step=1, key='grid_page'))
+
+        with run_metrics.stage('grid', rows_in=len(rows)) as stage:
+            window, n_selected = snapshot.index('grid').page(
+                None if len(rows) == len(df) else rows,
+                sort=None if grid_sort == "(none)" else grid_sort,
+                descending=grid_descending,
+                page=grid_page - 1,
+                page_size=grid_page_size,
+                columns=grid_columns or list(df.columns[:1]),
+                key=(query, search_term),
+            )
+            stage['rows_out'] = len(window)
+        first = (grid_page - 1) * grid_page_size
+        st.caption(f"Rows {first + 1 if len(window) else 0:,}–{first + len(window):,} of {n_selected:,} · page {grid_page} of {n_pages}")
+        st.dataframe(window, hide_index=True)
+
+# Build (or reuse) a figure from the shared pipeline definitions; the session
+# only holds `rows`, a selection into the shared dataset
+figure_options = {'scatter_max_points': SCATTER_MAX_POINTS, 'scatter_mode': scatter_mode}
+
+def cached_figure(name, key=None):
+    builder, args = pipeline.figure_inputs(name, cube, df, rows, figure_options)
+    return figure_cache.get_or_build(name, builder, *args, key=key)
+
+# Figures are built concurrently on a pool shared by all sessions
+PANEL_WORKERS = int(os.environ.get("DASHBOARD_PANEL_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+@st.cache_resource
+def load_panel_executor():
+    return ThreadPoolExecutor(PANEL_WORKERS, thread_name_prefix="panel")
+
+# Build one chart on a worker, timed as its own stage
+def build_chart(name, cache_key=None):
+    with run_metrics.stage(f'chart:{name}', rows_in=len(rows)):
+        return cached_figure(name, cache_key)
+
+# Row-level charts are keyed by filter state rather than hashing every row
+selection_key = (DATA_SOURCE, data_version, query, search_term)
+scatter_key = selection_key + (SCATTER_MAX_POINTS, scatter_mode)
+
+panels = PanelRun(load_panel_executor())
+
+# Start building a chart and reserve its slot, which is filled as soon as
+# the figure is ready. Charts in a collapsed fast-start section are skipped.
+def render_chart(container, name, key=None):
+    if not section_open:
+        return
+    panels.submit(name, build_chart, name, scatter_key if name == 'cost_revenue_scatter' else None)
+    panels.slot(container, name, key=key)
+
+# A row of charts below the fold: inline normally, a collapsed expander in
+# fast-start mode. Returns the container and whether its charts are built.
+def chart_section(label, key):
+    if not FAST_START:
+        return st.container(), True
+    section = st.expander(label, key=key, on_change='rerun')
+    return section, section.open is not False
+
+section_open = True
+
+# Display cards for KPIs
+card_container = st.container()
+with card_container:
+    col1, col2, col3 = st.columns(3, gap="large")
+
+    # Card: Total Revenue Generated
+    with col1:
+        if 'Revenue generated' in df.columns:
+            total_revenue = cube.total('Revenue generated')
+            st.markdown(
+                f"""
+                <div style="background-color: #f0f2f6; border-radius: 10px; padding: 20px; text-align: center; box-shadow: 0px 4px 6px rgba(0, 0, 0, 0.1);">
+                    <h2 style="font-size: 24px; color: #333;">💰 Total Revenue Generated</h2>
+                    <h1 style="font-size: 36px; color: #2b8c42;">₹{total_revenue:,.2f}</h1>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+        else:
+            st.warning("The 'Revenue generated' column is missing.")
+
+    # Card: Total Order Quantity
+    with col2:
+        if 'Order quantities' in df.columns:
+            total_order_quantity = cube.total('Order quantities')
+            st.markdown(
+                f"""
+                <div style="background-color: #f0f2f6; border-radius: 10px; padding: 20px; text-align: center; box-shadow: 0px 4px 6px rgba(0, 0, 0, 0.1);">
+                    <h2 style="font-size: 24px; color: #333;">📦 Total Order Quantity</h2>
+                    <h1 style="font-size: 36px; color: #2b8c42;">{total_order_quantity:,}</h1>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+        else:
+            st.warning("The 'Order quantities' column is missing.")
+
+    # Card: Total Availability
+    with col3:
+        if 'Stock levels' in df.columns:
+            total_availability = cube.total('Stock levels')
+            st.markdown(
+                f"""
+                <div style="background-color: #f0f2f6; border-radius: 10px; padding: 20px; text-align: center; box-shadow: 0px 4px 6px rgba(0, 0, 0, 0.1);">
+                    <h2 style="font-size: 24px; color: #333;">📊 Total Availability</h2>
+                    <h1 style="font-size: 36px; color: #2b8c42;">{total_availability:,}</h1>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+        else:
+            st.warning("The 'Stock levels' column is missing.")
+
+# Add space above the collapsible section
+st.markdown("<br><br>", unsafe_allow_html=True)  # Adds space above the summary
+# Standard rollups of the current selection; the unfiltered dataset's are
+# materialized when it loads, filtered ones come from the filtered cube
+@st.cache_resource(max_entries=64)
+def load_filtered_views(source, version, query, search_term, _cube):
+    return MaterializedViews.from_cube(_cube)
+
+# Display the summary text
+summary_expander = st.expander("📋 Show Summary", key='show_summary', on_change=EXPANDER_MODE)
+with summary_expander:
+    if summary_expander.open is not False:
+        if not STREAMING and cube is snapshot.cube:
+            summary_views = snapshot.views
+        else:
+            summary_views = load_filtered_views(DATA_SOURCE, data_version, query, search_term, cube)
+            st.caption("Reflects the current filters and search.")
+        st.markdown(summary_markdown(summary_views))
+
+# Create two columns for the two gauges side by side
+gauge_col1, gauge_col2 = st.columns(2)
+
+# Plot 1: Total Stock Levels
+if 'Stock levels' in df.columns:
+    render_chart(gauge_col1, 'stock_levels', key="stock_levels_chart")
+else:
+    gauge_col1.warning("The 'Stock levels' column is missing.")
+
+# Plot 2: Total Lead Times
+if 'Lead times' in df.columns:
+    render_chart(gauge_col2, 'lead_times', key="lead_times_chart")
+else:
+    gauge_col2.warning("The 'Lead times' column is missing.")
+
+# At-risk SKUs of the current selection
+section, section_open = chart_section("⚠️ At-risk SKUs", 'at_risk_section')
+if STREAMING:
+    section.caption("At-risk SKUs need the in-memory store and aren't available in streaming mode.")
+elif not all(col in df.columns for col in forecast.FORECAST_COLUMNS):
+    section.warning("The 'Number of products sold', 'Stock levels', 'Lead times' or 'Order quantities' columns are missing.")
+elif section_open:
+    with run_metrics.stage('forecast', rows_in=len(df)) as stage:
+        forecasts = snapshot.index('forecast')
+        stage['rows_out'] = len(forecasts)
+    risk_col1, risk_col2 = section.columns([1, 3])
+    with risk_col1:
+        risk_threshold = st.slider("Stock-out probability at least:", 0.0, 1.0, 0.5, 0.05, key='risk_threshold')
+        risk_limit = st.number_input("SKUs to list:", min_value=10, max_value=1000, value=100, step=10, key='risk_limit')
+        n_at_risk, at_risk_skus = forecast.at_risk(forecasts, rows, risk_threshold, risk_limit)
+        st.metric("SKUs at risk", f"{n_at_risk:,}")
+        st.metric("Below reorder point", f"{int(forecasts['Reorder now'].to_numpy()[rows].sum()):,}")
+        st.caption(
+            f"Demand is products sold over {forecast.SALES_PERIOD_DAYS:g} days; "
+            f"reorder points target a {forecast.SERVICE_LEVEL:.0%} service level."
+        )
+    risk_col2.dataframe(at_risk_skus, hide_index=True)
+
+# New Row for Revenue and Manufacturing Costs
+section, section_open = chart_section("📈 Revenue and Costs", 'revenue_costs_section')
+col1, col2 = section.columns(2)
+
+# Plot: Relationship between Manufacturing Costs and Revenue Generated
+with col1:
+    if 'Manufacturing costs' in df.columns and 'Revenue generated' in df.columns:
+        render_chart(col1, 'cost_revenue_scatter')
+    else:
+        col1.warning("The 'Manufacturing costs' or 'Revenue generated' columns are missing.")
+
+# Plot: Revenue Generated by Product Type
+with col2:
+    if 'Product type' in df.columns and 'Revenue generated' in df.columns:
+        render_chart(col2, 'revenue_by_product')
+    else:
+        col2.warning("The 'Product type' or 'Revenue generated' columns are missing.")
+
+
+# Create a layout with three columns
+section, section_open = chart_section("🗺️ Locations, Suppliers and Margins", 'breakdown_section')
+col1, col2, col3 = section.columns(3)
+
+# Visualization 1: Revenue Distribution by Location (Pie Chart)
+with col1:
+    if 'Revenue generated' in df.columns and 'Location' in df.columns:
+        render_chart(st, 'revenue_by_location', key="revenue_by_location")
+    else:
+        st.warning("Required columns ('Revenue generated', 'Location') are missing.")
+
+# Visualization 2: Distribution of Manufacturing Cost by Supplier (Pie Chart)
+with col2:
+    if 'Manufacturing costs' in df.columns and 'Supplier name' in df.columns:
+        render_chart(st, 'cost_by_supplier', key="cost_by_supplier")
+    else:
+        st.warning("Required columns ('Manufacturing costs', 'Supplier name') are missing.")
+
+# Visualization 3: Comparison of Price and Manufacturing Cost by Product Type (Bar Graph with Profit Margin)
+with col3:
+    if 'Price' in df.columns and 'Manufacturing costs' in df.columns and 'Product type' in df.columns:
+        # Mean price and manufacturing cost per type; the builder derives the profit margin
+        render_chart(st, 'price_vs_cost', key="price_vs_cost")
+    else:
+        st.warning("Required columns ('Price', 'Manufacturing costs', 'Product type') are missing.")
+
+# Adjusted layout with 3 visuals in 1 row for other visualizations
+section, section_open = chart_section("🚚 Quality and Logistics", 'logistics_section')
+col1, col2, col3 = section.columns(3)  # Create 3 columns for side-by-side layout
+
+# Plot 5: Manufacturing Costs by Inspection Results in col1
+with col1:
+    if 'Inspection results' in df.columns and 'Manufacturing costs' in df.columns:
+        render_chart(st, 'cost_inspection_results', key="cost_inspection_results")  # Add a unique key
+    else:
+        st.warning("The 'Inspection results' or 'Manufacturing costs' columns are missing.")
+
+# Plot 6: Order Quantities by Location in col2
+with col2:
+    if 'Location' in df.columns and 'Order quantities' in df.columns:
+        render_chart(st, 'order_quantities_location', key="order_quantities_location")  # Add a unique key
+
+# Total Order Quantities by Transportation Mode in col3
+with col3:
+    if 'Transportation modes' in df.columns and 'Order quantities' in df.columns:
+        render_chart(st, 'order_quantities_transportation_mode', key="order_quantities_transportation_mode")  # Add a unique key
+
+    else:
+        st.warning("The 'Transportation modes' or 'Order quantities' columns are missing.")
+
+# Supplier/carrier/route/mode lanes of the selection: cost per unit,
+# lead-time spread and the cost vs shipping time Pareto frontier. The lane
+# summary is computed on the panel pool like the charts (and cached with
+# them, by filter state); the frontier figure is built from it once ready.
+def build_lanes():
+    with run_metrics.stage('lanes', rows_in=len(rows)) as stage:
+        lanes = figure_cache.get_or_build('lanes', logistics.lane_summary, df, rows, key=selection_key)
+        stage['rows_out'] = len(lanes)
+    return lanes
+
+def build_lane_chart(lanes_future, cache_key):
+    lanes = lanes_future.result()
+    with run_metrics.stage('chart:lane_frontier', rows_in=len(lanes)):
+        return figure_cache.get_or_build('lane_frontier', charts.lane_frontier_scatter, lanes, key=cache_key)
+
+lane_table_slot = None
+section, section_open = chart_section("🧭 Supplier and Carrier Lanes", 'lanes_section')
+if not all(col in df.columns for col in logistics.LANE_DIMENSIONS + logistics.LANE_MEASURES):
+    section.warning("Lane analytics needs the supplier, carrier, route, mode, shipping cost/time, cost and lead time columns.")
+elif section_open:
+    lanes_future = panels.submit('lanes', build_lanes)
+    col1, col2 = section.columns(2)
+    panels.submit('lane_frontier', build_lane_chart, lanes_future, selection_key)
+    panels.slot(col1, 'lane_frontier', key="lane_frontier")
+    with col2:
+        if STREAMING:
+            st.caption(f"Computed from a sample of {len(df):,} matching rows.")
+        frontier_only = st.toggle("Only lanes on their supplier's Pareto frontier", key='lanes_frontier_only')
+        lane_table_slot = st.empty()
+
+# Stream the charts into their slots in completion order
+def draw_chart(placeholder, name, fig, key=None):
+    with run_metrics.stage(f'render:{name}'):
+        placeholder.plotly_chart(fig, key=key)
+
+panels.render(draw_chart)
+
+# The lane table fills in after the charts, so no slot above it waits on it
+if lane_table_slot is not None:
+    try:
+        lanes = lanes_future.result()
+    except Exception as error:
+        lane_table_slot.error(f"Couldn't build the lane summary: {error}")
+    else:
+        lane_table = lanes[lanes['Pareto within supplier']] if frontier_only else lanes
+        lane_table_slot.dataframe(lane_table.sort_values(['Supplier name', 'Shipping cost per unit']), hide_index=True)
+
+# Per-column memory of the shared dataset against naive object/64-bit columns
+@st.cache_resource(max_entries=2)
+def load_memory_report(source, version, _data):
+    return memory_report(_data)
+
+# Diagnostics panel: this run's stages, shared cache counters and dataset memory
+if st.sidebar.toggle("Show diagnostics", key='show_diagnostics'):
+    with st.sidebar.expander("🩺 Diagnostics", expanded=True):
+        st.checkbox("Trace allocations (slower)", key='trace_memory')
+        stage_table = pd.DataFrame(run_metrics.records)
+        stage_table['ms'] = (stage_table.pop('seconds') * 1000).round(2)
+        st.dataframe(stage_table, hide_index=True)
+        st.caption(
+            f"Rerun wall time: {run_metrics.elapsed_seconds * 1000:,.1f} ms "
+            f"(stage time summed across threads: {run_metrics.total_seconds * 1000:,.1f} ms)"
+        )
+        st.json({'figure_cache': figure_cache.stats()}, expanded=False)
+        if STREAMING:
+            st.json({'stream': stream.scan}, expanded=False)
+        else:
+            dataset_memory = load_memory_report(DATA_SOURCE, snapshot.version, snapshot.data)
+            st.caption(
+                f"Dataset memory: {dataset_memory['bytes'].sum() / 2**20:,.2f} MiB "
+                f"(naive {dataset_memory['naive_bytes'].sum() / 2**20:,.2f} MiB)"
+            )
+            st.dataframe(dataset_memory, hide_index=True)
+
+metrics_registry.observe(run_metrics)
@@ -0,0 +1 @@
+# Data and analytics layer behind the Streamlit dashboard in app.py
@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from dashboard import pipeline, streaming, synthetic
+from dashboard.filters import Query
+from dashboard.schema import add_derived_columns
+from dashboard.sources import load_dataset
+
+# Headless benchmark of the dashboard pipeline on synthetic data:
+#
+#   python -m dashboard.bench --rows 1000 100000 1000000 --format feather --jsonl bench.jsonl
+#
+# Every stage and every figure is timed (best of --repeat runs) and then run
+# once more under tracemalloc to record its peak allocation. tracemalloc sees
+# Python and NumPy allocations; Arrow-owned buffers (memory-mapped snapshots)
+# are not counted.
+
+# A typical narrowed sidebar state
+BENCH_QUERY = Query.from_widgets(
+    categories={
+        'Product type': ['haircare', 'skincare'],
+        'Location': ['Mumbai', 'Kolkata', 'Chennai'],
+    },
+    ranges={
+        'Manufacturing costs': (20, 80),
+        'Order quantities': (10, 90),
+    },
+)
+
+
+# Best wall time over `repeat` runs, then peak traced bytes of one more run
+def measure(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def bench_size(n_rows, fmt, repeat, options, workdir):
+    path = os.path.join(workdir, f"synthetic-{n_rows}.{fmt}")
+    synthetic.write_dataset(path, n_rows)
+    snapshot_dir = os.path.join(workdir, 'snapshots')
+    records = []
+
+    def record(stage, fn, rows_in, rows_out=None, times=repeat):
+        result, seconds, peak = measure(fn, times)
+        records.append({
+            'rows': n_rows, 'format': fmt, 'stage': stage, 'seconds': seconds,
+            'peak_bytes': peak, 'rows_in': rows_in,
+            'rows_out': rows_out(result) if rows_out else rows_in,
+        })
+        return result
+
+    # Cold load parses (and snapshots) text sources; warm load reuses the snapshot
+    record('load_cold', lambda: load_dataset(path, snapshot_dir=tempfile.mkdtemp(dir=workdir)), n_rows, times=1)
+    df = record('load', lambda: add_derived_columns(load_dataset(path, snapshot_dir=snapshot_dir)), n_rows)
+
+    filter_index, layout = record('index', lambda: pipeline.build_indexes(df), n_rows)
+    rows = record('filter', lambda: filter_index.evaluate(BENCH_QUERY), n_rows, len)
+    cube = record('aggregate', lambda: layout.aggregate(df, rows), len(rows), lambda c: len(c.cells))
+
+    # Out-of-core equivalent of filter + aggregate: one pass over the source
+    record('stream', lambda: streaming.stream_query(path, BENCH_QUERY), n_rows, lambda r: r.n_rows)
+
+    for name in pipeline.available_figures(df.columns):
+        fig = record(f'figure:{name}', lambda: pipeline.build_figure(name, cube, df, rows, options), len(rows))
+        record(f'serialize:{name}', lambda: fig.to_json(), len(rows), len)
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pipeline on synthetic data.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000],
+                        help="dataset sizes to run (up to 10^8)")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'feather'], default='csv',
+                        help="on-disk format of the synthetic source")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage (best is reported)")
+    parser.add_argument('--scatter-max-points', type=int, default=pipeline.DEFAULT_OPTIONS['scatter_max_points'])
+    parser.add_argument('--scatter-mode', choices=['sample', 'density'], default=pipeline.DEFAULT_OPTIONS['scatter_mode'])
+    parser.add_argument('--jsonl', help="append one JSON record per stage to this file")
+    args = parser.parse_args(argv)
+
+    options = {'scatter_max_points': args.scatter_max_points, 'scatter_mode': args.scatter_mode}
+    out = open(args.jsonl, 'a') if args.jsonl else None
+    print(f"{'rows':>12} {'stage':<48} {'ms':>10} {'peak MiB':>10} {'rows out':>12}")
+    try:
+        for n_rows in args.rows:
+            with tempfile.TemporaryDirectory() as workdir:
+                for rec in bench_size(n_rows, args.format, args.repeat, options, workdir):
+                    print(f"{rec['rows']:>12,} {rec['stage']:<48} {rec['seconds'] * 1000:>10.2f} "
+                          f"{rec['peak_bytes'] / 2**20:>10.2f} {rec['rows_out']:>12,}")
+                    if out:
+                        out.write(json.dumps(rec) + '\n')
+            sys.stdout.flush()
+    finally:
+        if out:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,333 @@
+import importlib
+
+import numpy as np
+
+from dashboard import sampling
+
+
+# Stand-in for a module that is imported on first attribute access
+class _LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+# plotly is only imported once the first figure is built, so importing the
+# pipeline (and the app's first paint) doesn't wait for it
+px = _LazyModule('plotly.express')
+go = _LazyModule('plotly.graph_objects')
+
+# Figure builders for the dashboard. Each takes already-aggregated inputs
+# and returns a new figure, so results can be cached and shared.
+
+
+# Gauge for a summed measure (stock levels, lead times)
+def total_gauge(total, title, bar_color):
+    fig = go.Figure(go.Indicator(
+        mode="number+gauge",
+        value=total,
+        gauge={
+            'axis': {'range': [0, total * 1.2]},
+            'bar': {'color': bar_color},
+            'steps': [
+                {'range': [0, total / 2], 'color': "lightgray"},
+                {'range': [total / 2, total], 'color': "gray"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': total
+            }
+        }
+    ))
+
+    fig.update_layout(
+        title={'text': title, 'font': {'size': 20}},
+        font=dict(size=18, color='white'),
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+    )
+    return fig
+
+
+# Relationship between Manufacturing Costs and Revenue Generated. Above
+# max_points rows the chart switches to a stratified sample per Product
+# type ('sample') or a binned density heatmap ('density'); outliers are
+# always drawn as individual points. Only the plotted columns of the
+# selected rows are materialized from the shared dataset.
+def cost_revenue_scatter(data, rows, max_points=None, mode='sample'):
+    x, y = 'Manufacturing costs', 'Revenue generated'
+    df = data[[col for col in (x, y, 'Product type') if col in data.columns]].take(rows)
+    if max_points is not None and len(df) > max_points:
+        if mode == 'density':
+            return cost_revenue_density(df, max_points)
+        df = df.take(sampling.reduce_points(df, x, y, 'Product type', max_points))
+        title = f'Relationship between Manufacturing Costs and Revenue Generated ({len(df):,} sampled points)'
+    else:
+        title = 'Relationship between Manufacturing Costs and Revenue Generated'
+
+    fig = px.scatter(
+        df,
+        x=x,
+        y=y,
+        title=title,
+        labels={
+            'Manufacturing costs': 'Manufacturing Costs ($)',
+            'Revenue generated': 'Revenue Generated ($)'
+        },
+        color='Product type' if 'Product type' in df.columns else None,
+        size='Revenue generated',
+        hover_data=['Product type'] if 'Product type' in df.columns else None
+    )
+
+    fig.update_layout(
+        xaxis_title="Manufacturing Costs ($)",
+        yaxis_title="Revenue Generated ($)",
+        font=dict(size=14, color='white'),
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)'
+    )
+
+    fig.update_traces(marker=dict(opacity=0.8))
+    return fig
+
+
+# Density-mode variant: row counts per 2D bin, with outliers overlaid
+def cost_revenue_density(df, max_outliers):
+    x, y = 'Manufacturing costs', 'Revenue generated'
+    counts, x_centers, y_centers = sampling.density_grid(df, x, y)
+
+    fig = go.Figure(go.Heatmap(
+        x=x_centers, y=y_centers, z=np.where(counts > 0, counts, np.nan),
+        colorscale='Viridis', colorbar=dict(title='Rows'),
+        hovertemplate='Cost %{x:.2f}<br>Revenue %{y:.2f}<br>%{z} rows<extra></extra>',
+    ))
+
+    scores = sampling.outlier_scores(df[x].to_numpy(dtype=np.float64), df[y].to_numpy(dtype=np.float64))
+    outliers = np.flatnonzero(scores > 0)
+    if len(outliers):
+        outliers = outliers[np.argsort(scores[outliers])[-max_outliers:]]
+        points = df.take(outliers)
+        fig.add_scatter(
+            x=points[x], y=points[y], mode='markers', name='Outliers',
+            marker=dict(color='red', size=6, opacity=0.8),
+            text=points['Product type'] if 'Product type' in points.columns else None,
+        )
+
+    fig.update_layout(
+        title=f'Manufacturing Costs vs Revenue Generated (density of {len(df):,} rows)',
+        xaxis_title="Manufacturing Costs ($)",
+        yaxis_title="Revenue Generated ($)",
+        font=dict(size=14, color='white'),
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)'
+    )
+    return fig
+
+
+# Revenue Generated by Product Type
+def revenue_by_product_bar(revenue_by_product):
+    fig = px.bar(
+        revenue_by_product,
+        x='Product type',
+        y='Revenue generated',
+        title='Revenue Generated by Product Type',
+        labels={'Revenue generated': 'Total Revenue ($)', 'Product type': 'Product Type'}
+    )
+
+    fig.update_layout(
+        xaxis_title="Product Type",
+        yaxis_title="Total Revenue ($)",
+        yaxis_tickprefix="$",
+        yaxis_tickformat=".2f",
+        margin=dict(l=40, r=40, t=40, b=40),
+        font=dict(size=14, color='white'),
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+        bargap=0,
+        bargroupgap=0.1
+    )
+
+    fig.update_traces(marker=dict(color=['#813cf6', '#15abbd', '#df9def']))
+    return fig
+
+
+# Manufacturing Costs by Inspection Results
+def inspection_cost_pie(cost_summary):
+    cost_summary = cost_summary.copy()
+    total_costs = cost_summary['Manufacturing costs'].sum()
+
+    cost_summary['Percentage Contribution'] = (cost_summary['Manufacturing costs'] / total_costs * 100).round(2)
+
+    cost_summary['Manufacturing costs'] = cost_summary['Manufacturing costs'].astype(float).round(2)
+    cost_summary['Percentage Contribution'] = cost_summary['Percentage Contribution'].astype(float).round(2)
+
+    cost_summary = cost_summary.sort_values(by='Manufacturing costs', ascending=False)
+
+    fig = px.pie(
+        cost_summary,
+        names='Inspection results',
+        values='Manufacturing costs',
+        title='Manufacturing Costs by Inspection Results',
+        color_discrete_sequence=px.colors.sequential.Plasma  # Updated color scheme
+    )
+
+    fig.update_traces(
+        hoverinfo='label+value+percent',
+        textinfo='value+percent'
+    )
+
+    fig.update_layout(
+        font=dict(size=14, color='white'),
+        showlegend=True,
+        legend_title_text='Inspection Results',
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+    )
+    return fig
+
+
+# Order Quantities by Location
+def orders_by_location_bar(result):
+    result = result.sort_values(by='Order quantities', ascending=False)
+
+    fig = px.bar(result, x='Location', y='Order quantities',
+                 title='Order Quantities by Location',
+                 labels={'Location': 'Location', 'Order quantities': 'Total Order Quantities'},
+                 color='Location',
+                 color_discrete_sequence=px.colors.qualitative.Set1,  # Updated color scheme
+                )
+
+    fig.update_layout(
+        xaxis_title="Location",
+        yaxis_title="Total Order Quantities",
+        font=dict(size=14, color='white'),
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+        bargap=0.1,
+    )
+    return fig
+
+
+# Total Order Quantities by Transportation Mode
+def orders_by_transport_pie(transport_data):
+    # Navy blue to light blue color gradient
+    fig = px.pie(
+        transport_data,
+        names='Transportation modes',
+        values='Order quantities',
+        title='Order Quantities by Transportation Mode',
+        color_discrete_sequence=['#003366', '#3366CC', '#66CCFF']
+    )
+
+    fig.update_traces(textinfo='percent+label')
+    fig.update_layout(
+        font=dict(size=14, color='white'),
+        showlegend=True,
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+    )
+    return fig
+
+
+# Revenue Distribution by Location
+def revenue_by_location_pie(revenue_by_location):
+    custom_colors = ['#d62728', '#e33bc2', '#ff7f0e', '#1f77b4', '#2ca02c']
+    fig = go.Figure(go.Pie(
+        labels=revenue_by_location['Location'],
+        values=revenue_by_location['Revenue generated'],
+        marker=dict(colors=custom_colors[:len(revenue_by_location)]),
+        texttemplate='%{label}<br>%{percent:.1%}',
+        sort=False,
+    ))
+
+    fig.update_layout(
+        title={'text': "Revenue by Location", 'font': {'size': 16}},
+        font=dict(size=12, color='white'),
+        showlegend=False,
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+    )
+    return fig
+
+
+# Distribution of Manufacturing Cost by Supplier
+def cost_by_supplier_pie(cost_by_supplier):
+    fig = go.Figure(go.Pie(
+        labels=cost_by_supplier['Supplier name'],
+        values=cost_by_supplier['Manufacturing costs'],
+        marker=dict(colors=px.colors.qualitative.Set2[:len(cost_by_supplier)]),
+        texttemplate='%{label}<br>%{percent:.1%}',
+        sort=False,
+    ))
+
+    fig.update_layout(
+        title={'text': "Manufacturing Costs by Supplier", 'font': {'size': 16}},
+        font=dict(size=12, color='white'),
+        showlegend=False,
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+    )
+    return fig
+
+
+# Comparison of Price and Manufacturing Cost by Product Type, with profit margin
+def price_cost_bar(means_by_product):
+    product_types = means_by_product['Product type']
+    price_aggregated = means_by_product['Price']
+    manufacturing_cost_aggregated = means_by_product['Manufacturing costs']
+    profit_margins = ((price_aggregated - manufacturing_cost_aggregated) / price_aggregated * 100).round(2)
+
+    fig = go.Figure()
+    fig.add_bar(x=product_types, y=price_aggregated, name='Price', marker_color='blue',
+                text=[f'{profit:.1f}%' for profit in profit_margins], textposition='outside')
+    fig.add_bar(x=product_types, y=manufacturing_cost_aggregated, name='Manufacturing Cost', marker_color='orange')
+
+    fig.update_layout(
+        barmode='group',
+        xaxis_title="Product Type",
+        yaxis_title="Cost / Price",
+        xaxis_tickangle=-45,
+        legend=dict(x=0, y=1, bgcolor='rgba(0, 0, 0, 0)'),
+        font=dict(size=12, color='white'),
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+    )
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+# Shipping lanes by shipping cost per unit vs mean shipping time, with the
+# Pareto frontier (no lane both cheaper and faster) drawn as a line
+def lane_frontier_scatter(lanes):
+    lanes = lanes.dropna(subset=['Shipping cost per unit', 'Mean shipping time'])
+    frontier = lanes[lanes['Pareto']].sort_values('Mean shipping time')
+    hover = [col for col in ('Supplier name', 'Shipping carriers', 'Routes', 'Shipments', 'Lead time p90') if col in lanes.columns]
+
+    fig = px.scatter(
+        lanes,
+        x='Mean shipping time',
+        y='Shipping cost per unit',
+        title='Shipping Lanes: Cost per Unit vs Shipping Time',
+        color='Transportation modes' if 'Transportation modes' in lanes.columns else None,
+        size='Shipments',
+        hover_data=hover,
+    )
+    fig.add_trace(go.Scatter(
+        x=frontier['Mean shipping time'], y=frontier['Shipping cost per unit'],
+        mode='lines', name='Pareto frontier', line=dict(color='white', dash='dash'),
+    ))
+
+    fig.update_layout(
+        xaxis_title="Mean Shipping Time (days)",
+        yaxis_title="Shipping Cost per Unit ($)",
+        font=dict(size=14, color='white'),
+        plot_bgcolor='rgba(0, 0, 0, 0)',
+        paper_bgcolor='rgba(0, 0, 0, 0)'
+    )
+    return fig
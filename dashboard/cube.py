@@ -0,0 +1,198 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import column_codes
+
+# Categorical dimensions the charts break measures down by
+CUBE_DIMENSIONS = ['Product type', 'Location', 'Supplier name', 'Inspection results', 'Transportation modes', 'Routes']
+
+# Measures accumulated per cell; means are derived as sum / count
+CUBE_MEASURES = ['Revenue generated', 'Order quantities', 'Stock levels', 'Lead times', 'Price', 'Manufacturing costs']
+
+
+# Above this many possible cells, occupied cells are found by sorting instead
+DENSE_CELL_LIMIT = 1 << 22
+
+
+# Maps every row of a dataset to a cube cell id. Built once per dataset;
+# aggregate() then fills a cube for any row selection in a single scan.
+class CubeLayout:
+    def __init__(self, df, dimensions=CUBE_DIMENSIONS, measures=CUBE_MEASURES):
+        self.dimensions = [dim for dim in dimensions if dim in df.columns]
+        self.measures = [m for m in measures if m in df.columns]
+        self.integer_measures = {m for m in self.measures if pd.api.types.is_integer_dtype(df[m].dtype)}
+
+        # Slot 0 of every dimension holds rows with a missing value
+        self.levels = []
+        self.sizes = []
+        cell_ids = np.zeros(len(df), dtype=np.int64)
+        stride = 1
+        self.strides = []
+        for dim in self.dimensions:
+            codes, values = column_codes(df[dim])
+            self.levels.append(values)
+            self.sizes.append(len(values) + 1)
+            self.strides.append(stride)
+            cell_ids += (codes.astype(np.int64) + 1) * stride
+            stride *= len(values) + 1
+        self.n_cells = stride
+        self.cell_ids = cell_ids
+
+    # Cell ids for rows outside the layout's dataset (e.g. newly ingested
+    # ones). Returns None if any row has a level the layout doesn't know.
+    def assign(self, frame):
+        ids = np.zeros(len(frame), dtype=np.int64)
+        for dim, levels, stride in zip(self.dimensions, self.levels, self.strides):
+            codes = pd.Index(levels).get_indexer(frame[dim]).astype(np.int64)
+            if ((codes < 0) & frame[dim].notna().to_numpy()).any():
+                return None
+            ids += (codes + 1) * stride
+        return ids
+
+    # Same dimensions and levels over a different set of rows
+    def with_cell_ids(self, cell_ids):
+        layout = copy.copy(self)
+        layout.cell_ids = cell_ids
+        return layout
+
+    # Accumulate per-cell sums and counts for the selected row positions
+    def aggregate(self, df, rows=None):
+        ids = self.cell_ids if rows is None else self.cell_ids[rows]
+        return self._aggregate(ids, df, rows)
+
+    # Cube of rows that are not (yet) part of the dataset; None on unknown levels
+    def aggregate_frame(self, frame):
+        ids = self.assign(frame)
+        return None if ids is None else self._aggregate(ids, frame, None)
+
+    def _aggregate(self, ids, df, rows):
+        if self.n_cells <= DENSE_CELL_LIMIT:
+            # Bin straight into the dense cell space, then keep occupied cells
+            dense = np.bincount(ids, minlength=self.n_cells)
+            present = np.flatnonzero(dense)
+            keys, size = ids, self.n_cells
+        else:
+            present, keys = np.unique(ids, return_inverse=True)
+            size = len(present)
+            dense = None
+
+        def accumulate(weights=None):
+            totals = np.bincount(keys, weights=weights, minlength=size)
+            return totals[present] if dense is not None else totals
+
+        sums = {}
+        counts = {}
+        for measure in self.measures:
+            values = df[measure].to_numpy(dtype=np.float64, na_value=np.nan)
+            if rows is not None:
+                values = values[rows]
+            valid = ~np.isnan(values)
+            sums[measure] = accumulate(np.where(valid, values, 0.0))
+            counts[measure] = accumulate(valid.astype(np.float64))
+        rows_per_cell = (dense[present] if dense is not None else accumulate()).astype(np.float64)
+        return Cube(self, present, sums, counts, rows_per_cell)
+
+
+# Pre-aggregated measures over the categorical dimensions. Every KPI card
+# and chart rolls up from these cells instead of rescanning rows.
+class Cube:
+    def __init__(self, layout, cells, sums, counts, rows_per_cell):
+        self.layout = layout
+        self.cells = cells
+        self.sums = sums
+        self.counts = counts
+        self.rows_per_cell = rows_per_cell
+
+    # Cell-wise sum (sign=1) or difference (sign=-1) of two cubes on the same
+    # layout; lets running totals absorb deltas without touching raw rows.
+    def combine(self, other, sign=1):
+        present, keys = np.unique(np.concatenate([self.cells, other.cells]), return_inverse=True)
+
+        def merge(mine, theirs):
+            return np.bincount(keys, weights=np.concatenate([mine, sign * theirs]), minlength=len(present))
+
+        rows_per_cell = merge(self.rows_per_cell, other.rows_per_cell)
+        keep = rows_per_cell > 0.5  # drop cells emptied by a subtraction
+        sums = {m: merge(self.sums[m], other.sums[m])[keep] for m in self.sums}
+        counts = {m: merge(self.counts[m], other.counts[m])[keep] for m in self.counts}
+        return Cube(self.layout, present[keep], sums, counts, rows_per_cell[keep])
+
+    # The same cells re-encoded on another layout with the same dimensions
+    # whose levels include all of this cube's (e.g. grown or re-sorted)
+    def relayout(self, layout):
+        cells = np.zeros(len(self.cells), dtype=np.int64)
+        for dim, levels, stride in zip(layout.dimensions, layout.levels, layout.strides):
+            i = self.layout.dimensions.index(dim)
+            positions = pd.Index(levels).get_indexer(self.layout.levels[i])
+            cells += np.concatenate(([0], positions + 1))[self.codes(dim)] * stride
+        order = np.argsort(cells, kind='stable')
+        return Cube(
+            layout, cells[order],
+            {m: values[order] for m, values in self.sums.items()},
+            {m: values[order] for m, values in self.counts.items()},
+            self.rows_per_cell[order],
+        )
+
+    # Sub-cube of the cells whose levels are selected, given as
+    # ((dimension, (value, ...)), ...): the same cube as aggregating the rows
+    # that pass those category filters. A dimension with every observed
+    # level selected isn't filtered (missing values stay), like FilterIndex.
+    def slice(self, selection):
+        keep = np.ones(len(self.cells), dtype=bool)
+        for dim, values in selection:
+            i = self.layout.dimensions.index(dim)
+            wanted = np.zeros(self.layout.sizes[i], dtype=bool)
+            positions = pd.Index(self.layout.levels[i]).get_indexer(list(values))
+            wanted[positions[positions >= 0] + 1] = True
+            codes = self.codes(dim)
+            if wanted[codes[codes > 0]].all():
+                continue
+            keep &= wanted[codes]
+        return Cube(
+            self.layout, self.cells[keep],
+            {m: values[keep] for m, values in self.sums.items()},
+            {m: values[keep] for m, values in self.counts.items()},
+            self.rows_per_cell[keep],
+        )
+
+    @property
+    def n_rows(self):
+        return int(self.rows_per_cell.sum())
+
+    def _value(self, measure, value):
+        return int(round(value)) if measure in self.layout.integer_measures else float(value)
+
+    def total(self, measure):
+        return self._value(measure, self.sums[measure].sum())
+
+    def mean(self, measure):
+        count = self.counts[measure].sum()
+        return float(self.sums[measure].sum() / count) if count else float('nan')
+
+    # Level codes (1-based, 0 = missing) of a dimension for every cell
+    def codes(self, dimension):
+        i = self.layout.dimensions.index(dimension)
+        return (self.cells // self.layout.strides[i]) % self.layout.sizes[i]
+
+    # Measures per level of one dimension, shaped like groupby().agg().reset_index()
+    def rollup(self, dimension, measures, how='sum'):
+        i = self.layout.dimensions.index(dimension)
+        levels = self.layout.levels[i]
+        codes = self.codes(dimension)
+        size = self.layout.sizes[i]
+
+        observed = np.bincount(codes, weights=self.rows_per_cell, minlength=size)[1:] > 0
+        result = {dimension: [level for level, seen in zip(levels, observed) if seen]}
+        for measure in measures:
+            totals = np.bincount(codes, weights=self.sums[measure], minlength=size)[1:][observed]
+            if how == 'mean':
+                counts = np.bincount(codes, weights=self.counts[measure], minlength=size)[1:][observed]
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    result[measure] = totals / counts
+            elif measure in self.layout.integer_measures:
+                result[measure] = np.rint(totals).astype(np.int64)
+            else:
+                result[measure] = totals
+        return pd.DataFrame(result)
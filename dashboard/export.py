@@ -0,0 +1,266 @@
+import argparse
+import html
+import importlib.util
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from dashboard import pipeline
+from dashboard.cube import CubeLayout
+from dashboard.filters import CATEGORY_FILTERS, RANGE_FILTERS, FilterIndex, Query
+from dashboard.schema import add_derived_columns
+from dashboard.search import SearchIndex
+from dashboard.sources import DEFAULT_SOURCE, load_dataset
+from dashboard.views import MaterializedViews, summary_markdown
+
+# Headless batch export of dashboard snapshots, one static page per filter
+# preset:
+#
+#   python -m dashboard.export --by Location --by "Supplier name" --out reports/
+#   python -m dashboard.export --presets presets.json --png --out reports/
+#
+# The dataset, filter index, cube layout and unfiltered cube are built once.
+# Presets that only select cube dimension levels get their cube by slicing
+# the shared one; others aggregate their selected rows. Figures are built
+# and written by worker processes that share the prepared state (inherited
+# on fork, sent once per worker elsewhere).
+
+
+# A named sidebar state to export
+@dataclass(frozen=True)
+class Preset:
+    name: str
+    query: Query = field(default_factory=Query)
+    search: str = ''
+
+    # From {"name": ..., "categories": {col: [...]}, "ranges": {col: [low, high]}, "search": ...}
+    @classmethod
+    def from_dict(cls, spec):
+        query = Query.from_widgets(spec.get('categories'), spec.get('ranges'))
+        return cls(spec['name'], query, spec.get('search', ''))
+
+
+# One preset per observed level of each column (indexed by prepare())
+def presets_by(shared, columns):
+    presets = []
+    for column in columns:
+        values = shared['filter_index'].options[column]
+        presets += [Preset(f"{column} = {value}", Query.from_widgets({column: [value]})) for value in values]
+    return presets
+
+
+def slug(name):
+    return re.sub(r'[^A-Za-z0-9]+', '-', name).strip('-').lower() or 'preset'
+
+
+# Output file name (without extension) per preset: its slug, suffixed -2,
+# -3, ... where two presets share one (or it would overwrite the index)
+def file_names(presets):
+    names = []
+    used = {'index'}
+    for preset in presets:
+        base = name = slug(preset.name)
+        n = 1
+        while name in used:
+            n += 1
+            name = f"{base}-{n}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+# State shared by every preset, built once in the parent process. Besides
+# the sidebar filters, the filter index covers the cube dimensions and any
+# other columns presets filter on (by value or by range).
+def prepare(source, options=None, filter_columns=(), range_columns=()):
+    data = add_derived_columns(load_dataset(source))
+    missing = [col for col in [*filter_columns, *range_columns] if col not in data.columns]
+    if missing:
+        raise ValueError(f"Presets filter on missing columns: {', '.join(dict.fromkeys(missing))}")
+    not_numeric = [col for col in range_columns if not pd.api.types.is_numeric_dtype(data[col].dtype)]
+    if not_numeric:
+        raise ValueError(f"Preset ranges need numeric columns: {', '.join(dict.fromkeys(not_numeric))}")
+    layout = CubeLayout(data)
+    filter_index = FilterIndex(
+        data,
+        categories=list(dict.fromkeys([*CATEGORY_FILTERS, *layout.dimensions, *filter_columns])),
+        ranges=list(dict.fromkeys([*RANGE_FILTERS, *range_columns])),
+    )
+    return {
+        'data': data,
+        'filter_index': filter_index,
+        'layout': layout,
+        'cube': layout.aggregate(data),
+        'search_index': None,  # built by export() if a preset searches
+        'options': {**pipeline.DEFAULT_OPTIONS, **(options or {})},
+    }
+
+
+# Selected rows and cube of one preset
+def preset_selection(shared, preset):
+    search_rows = shared['search_index'].search(preset.search) if preset.search.strip() else None
+    rows = shared['filter_index'].evaluate(preset.query, row_set=search_rows)
+    layout = shared['layout']
+    if search_rows is None and not preset.query.ranges \
+            and all(col in layout.dimensions for col, _ in preset.query.categories):
+        cube = shared['cube'].slice(preset.query.categories)
+    else:
+        cube = layout.aggregate(shared['data'], rows)
+    return rows, cube
+
+
+KPI_CARDS = [
+    ('Revenue generated', "💰 Total Revenue Generated", "₹{:,.2f}"),
+    ('Order quantities', "📦 Total Order Quantity", "{:,}"),
+    ('Stock levels', "📊 Total Availability", "{:,}"),
+]
+
+
+def page_html(preset, views, figures):
+    cards = "".join(
+        f"""<div class="card"><h2>{title}</h2><h1>{fmt.format(views.totals[measure])}</h1></div>"""
+        for measure, title, fmt in KPI_CARDS if measure in views.totals
+    )
+    charts = "".join(
+        f'<div class="chart">{fig.to_html(full_html=False, include_plotlyjs=False, div_id=name)}</div>'
+        for name, fig in figures.items()
+    )
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Supply Chain Dashboard - {html.escape(preset.name)}</title>
+<script src="plotly.min.js"></script>
+<style>
+body {{ background: #0e1117; color: white; font-family: Arial, sans-serif; margin: 2em; }}
+h1.title {{ text-align: center; font-size: 3em; color: #71C6FF; }}
+.cards {{ display: flex; gap: 2em; }}
+.card {{ flex: 1; background: #f0f2f6; border-radius: 10px; padding: 20px; text-align: center; box-shadow: 0px 4px 6px rgba(0, 0, 0, 0.1); }}
+.card h2 {{ font-size: 24px; color: #333; }}
+.card h1 {{ font-size: 36px; color: #2b8c42; }}
+.charts {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(560px, 1fr)); gap: 1em; margin-top: 2em; }}
+</style>
+</head>
+<body>
+<h1 class="title">Supply Chain Dashboard</h1>
+<p>{html.escape(preset.name)} · {views.n_rows:,} rows</p>
+<div class="cards">{cards}</div>
+<div class="charts">{charts}</div>
+</body>
+</html>
+"""
+
+
+_shared = None
+
+
+def _init_worker(shared):
+    global _shared
+    _shared = shared
+
+
+# Build, render and write one preset's page (plus summary and PNGs) as name.*
+def render_preset(preset, name, out_dir, png=False):
+    start = time.perf_counter()
+    shared = _shared
+    rows, cube = preset_selection(shared, preset)
+    data = shared['data']
+    figures = {
+        figure_name: pipeline.build_figure(figure_name, cube, data, rows, shared['options'])
+        for figure_name in pipeline.available_figures(data.columns)
+    }
+    views = MaterializedViews.from_cube(cube)
+
+    with open(os.path.join(out_dir, f"{name}.html"), 'w', encoding='utf-8') as f:
+        f.write(page_html(preset, views, figures))
+    with open(os.path.join(out_dir, f"{name}.md"), 'w', encoding='utf-8') as f:
+        f.write(summary_markdown(views))
+    if png:
+        os.makedirs(os.path.join(out_dir, name), exist_ok=True)
+        for figure_name, fig in figures.items():
+            fig.write_image(os.path.join(out_dir, name, f"{figure_name}.png"))
+    return {'preset': preset.name, 'file': f"{name}.html", 'rows': len(rows), 'seconds': time.perf_counter() - start}
+
+
+def write_index(out_dir, results):
+    links = "".join(
+        f'<li><a href="{html.escape(result["file"])}">{html.escape(result["preset"])}</a> ({result["rows"]:,} rows)</li>'
+        for result in results
+    )
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>Supply Chain Dashboards</title></head>'
+                f'<body><h1>Supply Chain Dashboards</h1><ul>{links}</ul></body></html>\n')
+
+
+# Export every preset to out_dir; returns one result dict per preset in preset order
+def export(shared, presets, out_dir, workers=None, png=False):
+    os.makedirs(out_dir, exist_ok=True)
+    import plotly.offline
+    with open(os.path.join(out_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+        f.write(plotly.offline.get_plotlyjs())
+
+    if shared['search_index'] is None and any(preset.search.strip() for preset in presets):
+        shared['search_index'] = SearchIndex(shared['data'])
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    results = {}
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(shared,)) as pool:
+        futures = {
+            pool.submit(render_preset, preset, name, out_dir, png): i
+            for i, (preset, name) in enumerate(zip(presets, file_names(presets)))
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            print(f"{result['rows']:>12,} rows {result['seconds'] * 1000:>9.1f} ms  {result['file']}")
+            sys.stdout.flush()
+    ordered = [results[i] for i in range(len(presets))]
+    write_index(out_dir, ordered)
+    return ordered
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export static dashboard pages for a list of filter presets.")
+    parser.add_argument('--source', default=os.environ.get("DASHBOARD_DATA", DEFAULT_SOURCE), help="dataset to export")
+    parser.add_argument('--presets', help="JSON file with a list of presets "
+                        '({"name", "categories": {col: [values]}, "ranges": {col: [low, high]}, "search"})')
+    parser.add_argument('--by', action='append', default=[], metavar='COLUMN',
+                        help="add one preset per value of this column (repeatable)")
+    parser.add_argument('--no-all', action='store_true', help="skip the unfiltered 'All data' page")
+    parser.add_argument('--out', required=True, help="output directory")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--png', action='store_true', help="also write a PNG per chart (needs kaleido)")
+    parser.add_argument('--scatter-max-points', type=int, default=pipeline.DEFAULT_OPTIONS['scatter_max_points'])
+    parser.add_argument('--scatter-mode', choices=['sample', 'density'], default=pipeline.DEFAULT_OPTIONS['scatter_mode'])
+    args = parser.parse_args(argv)
+
+    if args.png and importlib.util.find_spec('kaleido') is None:
+        parser.error("--png needs the kaleido package")
+
+    presets = [] if args.no_all else [Preset("All data")]
+    if args.presets:
+        with open(args.presets, encoding='utf-8') as f:
+            presets += [Preset.from_dict(spec) for spec in json.load(f)]
+    if not presets and not args.by:
+        parser.error("no presets to export")
+
+    start = time.perf_counter()
+    options = {'scatter_max_points': args.scatter_max_points, 'scatter_mode': args.scatter_mode}
+    filter_columns = args.by + [col for preset in presets for col, _ in preset.query.categories]
+    range_columns = [col for preset in presets for col, _ in preset.query.ranges]
+    shared = prepare(args.source, options, filter_columns, range_columns)
+    presets += presets_by(shared, args.by)
+
+    export(shared, presets, args.out, args.workers, args.png)
+    print(f"{len(presets)} presets in {time.perf_counter() - start:.2f} s -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
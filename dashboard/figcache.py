@@ -0,0 +1,74 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# Stable digest of a figure's inputs: frames are hashed by content,
+# everything else by repr (queries, scalars, titles).
+def input_digest(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            labels = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(repr(list(labels)).encode())
+            digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(part.tobytes())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+# Process-wide LRU of built figures shared by every session. Figures are
+# treated as read-only once cached.
+class FigureCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Return the cached figure for these inputs, building it on a miss.
+    # Pass key= to identify large inputs (e.g. raw rows) by filter state
+    # instead of hashing their content.
+    def get_or_build(self, name, builder, *args, key=None):
+        entry_key = (name, input_digest(*(args if key is None else key)))
+        with self._lock:
+            fig = self._entries.get(entry_key)
+            if fig is not None:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return fig
+            self.misses += 1
+
+        fig = builder(*args)
+
+        with self._lock:
+            self._entries[entry_key] = fig
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
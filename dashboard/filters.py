@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Dimensions filtered with sidebar multiselects
+CATEGORY_FILTERS = ['Product type', 'Inspection results', 'Location', 'Transportation modes']
+
+# Measures filtered with sidebar range sliders
+RANGE_FILTERS = ['Manufacturing costs', 'Order quantities']
+
+
+# All sidebar widget state as one hashable query
+@dataclass(frozen=True)
+class Query:
+    categories: tuple = ()  # ((column, (value, ...)), ...)
+    ranges: tuple = ()  # ((column, (low, high)), ...)
+
+    @classmethod
+    def from_widgets(cls, categories=None, ranges=None):
+        categories = tuple(sorted((col, tuple(values)) for col, values in (categories or {}).items()))
+        ranges = tuple(sorted((col, (low, high)) for col, (low, high) in (ranges or {}).items()))
+        return cls(categories, ranges)
+
+
+# Integer codes and distinct values of a column (NaN -> -1)
+def column_codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return np.asarray(series.cat.codes), list(series.cat.categories)
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, list(uniques)
+
+
+# Per-dataset index: packed row bitmaps per category value and sorted
+# orderings of the range columns. Built once, then every query is answered
+# with bitwise ops on the bitmaps instead of chained boolean-mask copies.
+class FilterIndex:
+    def __init__(self, df, categories=CATEGORY_FILTERS, ranges=RANGE_FILTERS):
+        self.n_rows = len(df)
+        self.options = {}
+        self.bitmaps = {}
+        self.sorted = {}
+        self.bounds = {}
+
+        for column in categories:
+            if column not in df.columns:
+                continue
+            codes, values = column_codes(df[column])
+            present = np.bincount(codes[codes >= 0], minlength=len(values)) > 0
+            self.options[column] = [value for value, seen in zip(values, present) if seen]
+            self.bitmaps[column] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(values) if present[code]
+            }
+
+        for column in ranges:
+            if column not in df.columns:
+                continue
+            values = df[column].to_numpy(dtype=np.float64)
+            order = np.argsort(values, kind='stable')
+            sorted_values = values[order]
+            self.sorted[column] = (sorted_values, order)
+            finite = sorted_values[~np.isnan(sorted_values)]
+            if len(finite):
+                self.bounds[column] = (finite[0], finite[-1])
+
+    def _category_bits(self, column, selected):
+        bitmaps = self.bitmaps[column]
+        selected = [value for value in selected if value in bitmaps]
+        if len(selected) == len(bitmaps):
+            return None  # every value selected, nothing to filter
+        bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in selected:
+            np.bitwise_or(bits, bitmaps[value], out=bits)
+        return bits
+
+    def _range_bits(self, column, low, high):
+        sorted_values, order = self.sorted[column]
+        start = np.searchsorted(sorted_values, low, side='left')
+        stop = np.searchsorted(sorted_values, high, side='right')
+        n_valid = np.searchsorted(sorted_values, np.inf, side='right')  # NaNs sort last
+        if start == 0 and stop == n_valid:
+            return None  # range covers every value: no filter, missing values stay
+        hits = np.zeros(self.n_rows, dtype=bool)
+        hits[order[start:stop]] = True
+        return np.packbits(hits)
+
+    def _row_bits(self, row_set):
+        hits = np.zeros(self.n_rows, dtype=bool)
+        hits[row_set] = True
+        return np.packbits(hits)
+
+    # Evaluate the whole query and return matching row positions, optionally
+    # restricted to a precomputed row set (e.g. search hits)
+    def evaluate(self, query, row_set=None):
+        mask = None
+        parts = [self._category_bits(col, values) for col, values in query.categories if col in self.bitmaps]
+        parts += [self._range_bits(col, low, high) for col, (low, high) in query.ranges if col in self.sorted]
+        if row_set is not None:
+            parts.append(self._row_bits(row_set))
+        for bits in parts:
+            if bits is None:
+                continue
+            mask = bits if mask is None else np.bitwise_and(mask, bits, out=mask)
+
+        if mask is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(mask, count=self.n_rows))
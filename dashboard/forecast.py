@@ -0,0 +1,105 @@
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import column_codes
+
+# Per-SKU stock-out forecasting: days of cover, reorder point and the
+# probability that demand over the lead time exceeds stock on hand. Every
+# quantity is an array expression over all SKUs at once.
+
+# Days of sales that 'Number of products sold' covers
+SALES_PERIOD_DAYS = float(os.environ.get("DASHBOARD_SALES_PERIOD_DAYS", "30"))
+
+# Target probability of not stocking out during a lead time
+SERVICE_LEVEL = float(os.environ.get("DASHBOARD_SERVICE_LEVEL", "0.95"))
+
+FORECAST_COLUMNS = ['Number of products sold', 'Stock levels', 'Lead times', 'Order quantities']
+
+
+# Abramowitz & Stegun 7.1.26 (absolute error below 1.5e-7)
+def erf(x):
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return sign * (1.0 - poly * np.exp(-x * x))
+
+
+def normal_cdf(z):
+    return 0.5 * (1.0 + erf(z / np.sqrt(2.0)))
+
+
+# Population standard deviation of values within each group code
+def group_std(codes, values, n_groups):
+    valid = ~np.isnan(values)
+    counts = np.bincount(codes[valid], minlength=n_groups)
+    sums = np.bincount(codes[valid], weights=values[valid], minlength=n_groups)
+    squares = np.bincount(codes[valid], weights=values[valid] ** 2, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = squares / counts - (sums / counts) ** 2
+    return np.sqrt(np.clip(np.nan_to_num(variance), 0.0, None))
+
+
+# Forecast per SKU row. Daily demand is products sold over the sales period
+# and is treated as Poisson; a SKU's lead time varies like those of its
+# product type. Lead-time demand is then normal with
+#   mean = demand * lead time
+#   var  = demand * lead time + demand^2 * lead-time variance
+# and the reorder point covers it at the service level.
+def sku_forecast(df, period_days=SALES_PERIOD_DAYS, service_level=SERVICE_LEVEL, group='Product type'):
+    def values(column):
+        return df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    stock, lead, ordered = values('Stock levels'), values('Lead times'), values('Order quantities')
+    demand = values('Number of products sold') / period_days
+
+    if group in df.columns:
+        codes, levels = column_codes(df[group])
+        codes = codes.astype(np.int64) + 1
+        lead_sd = group_std(codes, lead, len(levels) + 1)[codes]
+    else:
+        lead_sd = np.full(len(df), np.nanstd(lead) if len(df) else 0.0)
+
+    mean_ltd = demand * lead
+    sd_ltd = np.sqrt(demand * lead + demand ** 2 * lead_sd ** 2)
+    reorder_point = mean_ltd + NormalDist().inv_cdf(service_level) * sd_ltd
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cover = np.where(demand > 0, stock / demand, np.inf)
+        cover_with_order = np.where(demand > 0, (stock + ordered) / demand, np.inf)
+        # Continuity-corrected: P(lead-time demand > stock)
+        z = (stock + 0.5 - mean_ltd) / sd_ltd
+    stockout = np.where(sd_ltd > 0, 1.0 - normal_cdf(z), (mean_ltd > stock).astype(np.float64))
+
+    result = {}
+    for column in ('SKU', 'Product type', 'Supplier name', 'Location'):
+        if column in df.columns:
+            result[column] = df[column].to_numpy()
+    result.update({
+        'Stock levels': df['Stock levels'].to_numpy(),
+        'Daily demand': demand,
+        'Days of cover': cover,
+        'Lead times': df['Lead times'].to_numpy(),
+        'Reorder point': reorder_point,
+        'Stock-out probability': stockout,
+        'Order quantities': df['Order quantities'].to_numpy(),
+        'Days of cover incl. order': cover_with_order,
+        'Reorder now': stock <= reorder_point,
+    })
+    return pd.DataFrame(result)
+
+
+# The selected SKUs (row positions, all if None) with a stock-out
+# probability of at least threshold: their count, and the `limit` most
+# at-risk of them, most likely first
+def at_risk(forecasts, rows=None, threshold=0.5, limit=100):
+    probability = forecasts['Stock-out probability'].to_numpy()
+    candidates = np.flatnonzero(probability >= threshold) if rows is None else rows[probability[rows] >= threshold]
+    count = len(candidates)
+    if count > limit:
+        candidates = candidates[np.argpartition(-probability[candidates], limit)[:limit]]
+    order = candidates[np.argsort(-probability[candidates], kind='stable')]
+    return count, forecasts.take(order)
@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Server-side paging for the dataset table: only one window of rows (and
+# the requested columns) is materialized and sent to the browser, whatever
+# the size of the dataset or of the selection.
+
+# Rows scanned per step when collecting a sorted page of a filtered selection
+SCAN_BLOCK = 1 << 16
+
+# Selection bitmaps kept per grid, keyed by filter state
+SELECTION_CACHE_SIZE = 16
+
+
+# Sortable, pageable view over one dataset version. Column orderings are
+# built on first use and shared by every session reading that version.
+class DataGrid:
+    def __init__(self, df):
+        self.data = df
+        self._orders = {}
+        self._ranks = {}
+        self._selections = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Row positions in sort order, missing values last in both directions
+    def order(self, column, descending=False):
+        key = (column, descending)
+        with self._lock:
+            if key not in self._orders:
+                series = self.data[column].reset_index(drop=True)
+                ascending = series.sort_values(kind='stable', na_position='last').index.to_numpy()
+                n_valid = int(series.notna().sum())
+                self._orders[(column, False)] = ascending
+                self._orders[(column, True)] = np.concatenate([ascending[:n_valid][::-1], ascending[n_valid:]])
+                ranks = np.empty(len(ascending), dtype=np.int64)
+                ranks[ascending] = np.arange(len(ascending))
+                self._ranks[column] = (ranks, n_valid)
+            return self._orders[key]
+
+    # Position of each given row in order(column, descending)
+    def ranks(self, column, descending, rows):
+        self.order(column, descending)
+        ranks, n_valid = self._ranks[column]
+        ranks = ranks[rows]
+        return np.where(ranks < n_valid, n_valid - 1 - ranks, ranks) if descending else ranks
+
+    # Packed row bitmap of a selection. Built once per key (the selection's
+    # filter state) and reused while paging, so a page change doesn't touch
+    # every selected row again.
+    def selection_bits(self, rows, key=None):
+        if key is None:
+            return self._bits(rows)
+        with self._lock:
+            bits = self._selections.get(key)
+            if bits is not None:
+                self._selections.move_to_end(key)
+                return bits
+        bits = self._bits(rows)
+        with self._lock:
+            self._selections[key] = bits
+            while len(self._selections) > SELECTION_CACHE_SIZE:
+                self._selections.popitem(last=False)
+        return bits
+
+    def _bits(self, rows):
+        hits = np.zeros(len(self.data), dtype=bool)
+        hits[rows] = True
+        return np.packbits(hits)
+
+    # Selected row positions (sorted ascending; None = every row) in display
+    # order, up to `stop`. Unsorted pages are a slice. Sorted pages of a
+    # large selection scan the column ordering block by block until the page
+    # is filled; a selection smaller than that scan is sorted by rank instead.
+    def _positions(self, rows, sort, descending, stop, key=None):
+        n_rows = len(self.data)
+        everything = rows is None or len(rows) == n_rows
+        if sort is None:
+            return np.arange(min(stop, n_rows)) if everything else rows[:stop]
+        order = self.order(sort, descending)
+        if everything:
+            return order[:stop]
+        if stop * n_rows > len(rows) * len(rows):
+            ranks = self.ranks(sort, descending, rows)
+            if stop < len(rows):
+                head = np.argpartition(ranks, stop)[:stop]
+                return rows[head[np.argsort(ranks[head])]]
+            return rows[np.argsort(ranks)]
+
+        bits = self.selection_bits(rows, key)
+        found = []
+        n_found = 0
+        start = 0
+        block = max(SCAN_BLOCK, 4 * stop)
+        while n_found < stop and start < n_rows:
+            chunk = order[start:start + block]
+            hits = chunk[(bits[chunk >> 3] >> (7 - (chunk & 7))) & 1 == 1]
+            found.append(hits)
+            n_found += len(hits)
+            start += block
+        return np.concatenate(found)[:stop] if found else np.empty(0, dtype=np.int64)
+
+    # One page of the selection: (window frame, selected row count). Pass
+    # key= to identify the selection (e.g. by filter state) so its bitmap is
+    # reused across pages and sort changes.
+    def page(self, rows=None, sort=None, descending=False, page=0, page_size=50, columns=None, key=None):
+        total = len(self.data) if rows is None else len(rows)
+        start = page * page_size
+        positions = self._positions(rows, sort, descending, start + page_size, key)[start:]
+        if columns is None:
+            return self.data.take(positions), total
+        return self.data.iloc[positions, self.data.columns.get_indexer(list(columns))], total
@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from dashboard.cube import CubeLayout
+from dashboard.schema import add_derived_columns
+from dashboard.sources import READERS
+from dashboard.views import MaterializedViews, materialize
+
+
+# Immutable view of the store at one version. Sessions keep using the
+# snapshot they started with while newer versions are published.
+# Per-version indexes (filter bitmaps, search postings, ...) are built from
+# `builders` on first use and kept with the snapshot.
+class Snapshot:
+    def __init__(self, version, data, layout, cube, views, builders=None):
+        self.version = version
+        self.data = data
+        self.layout = layout
+        self.cube = cube
+        self.views = views
+        self.builders = builders or {}
+        self._indexes = {}
+        self._locks = {name: threading.Lock() for name in self.builders}
+
+    def index(self, name):
+        with self._locks[name]:
+            if name not in self._indexes:
+                self._indexes[name] = self.builders[name](self.data)
+            return self._indexes[name]
+
+    # Names of the indexes built so far
+    def built(self):
+        return list(self._indexes)
+
+
+# Process-wide dataset that absorbs new and changed rows keyed by SKU.
+# Running aggregates (the unfiltered cube) are updated by subtracting the
+# replaced rows and adding the incoming ones instead of a full recompute.
+# The materialized views of the loaded version are reused from views_path.
+# A new version is published only once every index sessions have used on
+# the current one is rebuilt for it, so no rerun stalls on a rebuild.
+class DatasetStore:
+    def __init__(self, df, key='SKU', views_path=None, indexes=None):
+        df = add_derived_columns(df)
+        self.key = key
+        self._lock = threading.Lock()
+        self._seen_files = {}
+        self.failures = {}  # drop file path -> why it was skipped
+        self._last_poll = 0.0
+        layout = CubeLayout(df)
+        cube = layout.aggregate(df)
+        self._watcher = None
+        self._stop_watching = threading.Event()
+        weakref.finalize(self, self._stop_watching.set)
+        self._snapshot = Snapshot(0, df, layout, cube, materialize(cube, views_path), indexes)
+
+    def snapshot(self):
+        return self._snapshot
+
+    # Merge rows into the store; returns (added, changed) row counts
+    def upsert(self, incoming):
+        incoming = add_derived_columns(incoming.drop_duplicates(self.key, keep='last'))
+        with self._lock:
+            current = self._snapshot
+            data = current.data
+            incoming = conform(incoming, data)
+
+            positions = pd.Index(data[self.key]).get_indexer(incoming[self.key])
+            matched = positions >= 0
+
+            # Rows resent unchanged are not deltas
+            if matched.any():
+                old_hash = pd.util.hash_pandas_object(data.iloc[positions[matched]], index=False).to_numpy()
+                new_hash = pd.util.hash_pandas_object(incoming[matched], index=False).to_numpy()
+                differs = np.ones(len(incoming), dtype=bool)
+                differs[matched] = old_hash != new_hash
+                incoming, positions = incoming[differs], positions[differs]
+                matched = positions >= 0
+
+            changed, added = incoming[matched], incoming[~matched]
+            if not len(changed) and not len(added):
+                return 0, 0
+
+            updated = data.copy()
+            for j, col in enumerate(updated.columns):
+                if incoming[col].dtype != updated[col].dtype:
+                    if isinstance(updated[col].dtype, pd.CategoricalDtype):
+                        updated[col] = updated[col].cat.set_categories(incoming[col].cat.categories)
+                    else:
+                        updated[col] = updated[col].astype(incoming[col].dtype)
+                if len(changed):
+                    updated.iloc[positions[matched], j] = changed[col].to_numpy()
+            updated = pd.concat([updated, added], ignore_index=True)
+
+            layout = current.layout
+            changed_ids = layout.assign(changed)
+            added_ids = layout.assign(added)
+            if changed_ids is None or added_ids is None:
+                # New dimension levels change the cell space: rebuild once
+                layout = CubeLayout(updated)
+                cube = layout.aggregate(updated)
+            else:
+                cell_ids = np.concatenate([layout.cell_ids, added_ids])
+                cell_ids[positions[matched]] = changed_ids
+                layout = layout.with_cell_ids(cell_ids)
+                cube = current.cube
+                if len(changed):
+                    cube = cube.combine(current.layout.aggregate(data, positions[matched]), sign=-1)
+                    cube = cube.combine(layout.aggregate_frame(changed))
+                if len(added):
+                    cube = cube.combine(layout.aggregate_frame(added))
+                cube.layout = layout
+
+            snapshot = Snapshot(current.version + 1, updated, layout, cube, MaterializedViews.from_cube(cube), current.builders)
+            for name in current.built():
+                snapshot.index(name)
+            self._snapshot = snapshot
+            return len(added), len(changed)
+
+    # Ingest files that appeared (or changed) in a drop directory since the
+    # last poll. Polls at most once every min_interval seconds. A file that
+    # can't be read or merged is recorded in `failures` and skipped until it
+    # changes again (e.g. a partial write completing, or a corrected file).
+    def poll(self, drop_dir, min_interval=5.0):
+        now = time.monotonic()
+        if now - self._last_poll < min_interval or not os.path.isdir(drop_dir):
+            return 0, 0
+        self._last_poll = now
+
+        pending = []
+        for entry in os.scandir(drop_dir):
+            extension = os.path.splitext(entry.name)[1].lower()
+            if not entry.is_file() or extension not in READERS:
+                continue
+            stat = entry.stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._seen_files.get(entry.path) != signature:
+                pending.append((stat.st_mtime_ns, entry.path, extension, signature))
+
+        added = changed = 0
+        for _, path, extension, signature in sorted(pending):
+            self._seen_files[path] = signature
+            try:
+                n_added, n_changed = self.upsert(READERS[extension](path))
+            except Exception as exc:
+                self.failures[path] = f"{type(exc).__name__}: {exc}"
+                continue
+            self.failures.pop(path, None)
+            added += n_added
+            changed += n_changed
+        return added, changed
+
+    # Poll a drop directory every interval seconds on a background thread,
+    # so merges and index rebuilds never run inside a session's rerun. The
+    # thread only holds a weak reference: it ends on stop() or once the
+    # store is dropped (e.g. when Streamlit's resource cache is cleared).
+    def watch(self, drop_dir, interval=5.0):
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = threading.Thread(
+                    target=_watch, args=(weakref.ref(self), drop_dir, interval, self._stop_watching),
+                    name="drop-watch", daemon=True,
+                )
+                self._watcher.start()
+
+    def stop(self):
+        self._stop_watching.set()
+
+
+def _watch(store_ref, drop_dir, interval, stopped):
+    while not stopped.is_set():
+        store = store_ref()
+        if store is None:
+            return
+        store.poll(drop_dir, min_interval=0.0)
+        del store
+        stopped.wait(interval)
+
+
+# Align an incoming frame with the store's columns and dtypes. Categorical
+# columns keep the store's categories plus any new values; downcast numeric
+# columns are widened when incoming values don't fit.
+def conform(incoming, data):
+    missing = [col for col in data.columns if col not in incoming.columns]
+    if missing:
+        raise ValueError(f"Incoming rows are missing columns: {', '.join(missing)}")
+    incoming = incoming[list(data.columns)].copy()
+    for col, dtype in data.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            new_values = pd.Index(incoming[col].dropna().unique()).difference(dtype.categories)
+            categories = dtype.categories.append(new_values) if len(new_values) else dtype.categories
+            incoming[col] = pd.Categorical(incoming[col], categories=categories)
+        elif pd.api.types.is_integer_dtype(dtype):
+            values = pd.to_numeric(incoming[col])
+            if values.isna().any() or not pd.api.types.is_integer_dtype(values.dtype):
+                incoming[col] = values.astype(np.float64)
+            else:
+                fitted = pd.to_numeric(values, downcast='integer')
+                incoming[col] = values.astype(np.promote_types(dtype, fitted.dtype))
+        else:
+            incoming[col] = incoming[col].astype(dtype)
+    return incoming.reset_index(drop=True)
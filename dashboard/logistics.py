@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import column_codes
+
+# Shipping-lane analytics: cost per unit, lead-time distribution and the
+# cost vs shipping time Pareto frontier per lane. Everything is computed
+# with bincount / lexsort over integer lane codes, one pass per measure.
+
+# A lane is one (supplier, carrier, route, mode) combination
+LANE_DIMENSIONS = ['Supplier name', 'Shipping carriers', 'Routes', 'Transportation modes']
+
+# Shipment columns the lane summary reads
+LANE_MEASURES = ['Order quantities', 'Shipping costs', 'Costs', 'Shipping times', 'Lead times']
+
+# Lead-time quantiles reported per lane
+LEAD_TIME_QUANTILES = {'Lead time p50': 0.5, 'Lead time p90': 0.9}
+
+
+# Dense lane id of every selected row, plus the dimension values of each
+# lane. A missing dimension value is a level of its own.
+def lane_codes(df, rows=None, dimensions=LANE_DIMENSIONS):
+    ids = np.zeros(len(df) if rows is None else len(rows), dtype=np.int64)
+    levels = []
+    stride = 1
+    for dim in dimensions:
+        codes, values = column_codes(df[dim])
+        if rows is not None:
+            codes = codes[rows]
+        ids += (codes.astype(np.int64) + 1) * stride
+        levels.append(values)
+        stride *= len(values) + 1
+    lanes, inverse = np.unique(ids, return_inverse=True)
+
+    labels = {}
+    stride = 1
+    for dim, values in zip(dimensions, levels):
+        codes = (lanes // stride) % (len(values) + 1) - 1
+        labels[dim] = pd.Categorical.from_codes(codes, categories=values)
+        stride *= len(values) + 1
+    return inverse, labels
+
+
+# Per-group quantiles of values (NaNs ignored), interpolated linearly like
+# np.quantile: one lexsort, then direct indexing into every group's run
+def group_quantiles(groups, values, n_groups, quantiles):
+    valid = ~np.isnan(values)
+    groups, values = groups[valid], values[valid]
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    last = max(len(sorted_values) - 1, 0)
+
+    result = {}
+    for name, q in quantiles.items():
+        position = (counts - 1).clip(min=0) * q
+        below = np.floor(position).astype(np.int64)
+        above = np.ceil(position).astype(np.int64)
+        if len(sorted_values):
+            low = sorted_values[np.minimum(starts + below, last)]
+            high = sorted_values[np.minimum(starts + above, last)]
+            interpolated = low + (high - low) * (position - below)
+        else:
+            interpolated = np.zeros(n_groups)
+        result[name] = np.where(counts > 0, interpolated, np.nan)
+    return result
+
+
+# Points not dominated on (cost, time), lower being better on both, within
+# each group. Sorted by group, cost and time, a point is on the frontier
+# when it is faster than every cheaper point of its group before it (a
+# running minimum, segmented by offsetting each group below the last).
+# Identical points don't dominate each other: they share the first one's flag.
+def pareto_frontier(cost, time, groups=None):
+    frontier = np.zeros(len(cost), dtype=bool)
+    groups = np.zeros(len(cost), dtype=np.int64) if groups is None else groups
+    order = np.lexsort((time, cost, groups))
+    order = order[~(np.isnan(cost[order]) | np.isnan(time[order]))]
+    if not len(order):
+        return frontier
+
+    sorted_groups, sorted_cost, sorted_time = groups[order], cost[order], time[order]
+    first = np.concatenate(([True], sorted_groups[1:] != sorted_groups[:-1]))
+    rank = np.cumsum(first) - 1
+    span = sorted_time.max() - sorted_time.min() + 1.0
+    shifted = sorted_time - rank * span
+    previous = np.concatenate(([np.inf], np.minimum.accumulate(shifted)[:-1]))
+    on_frontier = first | (shifted < previous)
+
+    repeat = np.concatenate(([False], ~first[1:] & (sorted_cost[1:] == sorted_cost[:-1]) & (sorted_time[1:] == sorted_time[:-1])))
+    run_start = np.maximum.accumulate(np.where(repeat, 0, np.arange(len(order))))
+    frontier[order] = on_frontier[run_start]
+    return frontier
+
+
+# One row per lane of the selected shipments. Costs per unit divide summed
+# costs by summed order quantities; the frontier trades shipping cost per
+# unit against mean shipping time, across all lanes and within each supplier.
+def lane_summary(df, rows=None):
+    dimensions = [dim for dim in LANE_DIMENSIONS if dim in df.columns]
+    lane, labels = lane_codes(df, rows, dimensions)
+    n_lanes = len(labels[dimensions[0]]) if dimensions else 1
+
+    def values(column):
+        data = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        return data if rows is None else data[rows]
+
+    def total(data):
+        return np.bincount(lane, weights=np.nan_to_num(data), minlength=n_lanes)
+
+    def mean(data):
+        counts = np.bincount(lane, weights=(~np.isnan(data)).astype(np.float64), minlength=n_lanes)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return total(data) / counts
+
+    units = total(values('Order quantities'))
+    lead_times = values('Lead times')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shipping_per_unit = np.where(units > 0, total(values('Shipping costs')) / units, np.nan)
+        cost_per_unit = np.where(units > 0, total(values('Costs')) / units, np.nan)
+
+    summary = pd.DataFrame({
+        **labels,
+        'Shipments': np.bincount(lane, minlength=n_lanes),
+        'Units': units.astype(np.int64),
+        'Shipping cost per unit': shipping_per_unit,
+        'Cost per unit': cost_per_unit,
+        'Mean shipping cost': mean(values('Shipping costs')),
+        'Mean shipping time': mean(values('Shipping times')),
+        'Mean lead time': mean(lead_times),
+        **group_quantiles(lane, lead_times, n_lanes, LEAD_TIME_QUANTILES),
+    })
+    mean_time = summary['Mean shipping time'].to_numpy()
+    summary['Pareto'] = pareto_frontier(shipping_per_unit, mean_time)
+    if 'Supplier name' in labels:
+        supplier = np.asarray(labels['Supplier name'].codes, dtype=np.int64)
+        summary['Pareto within supplier'] = pareto_frontier(shipping_per_unit, mean_time, supplier)
+    return summary
@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+# Per-rerun instrumentation of pipeline stages and charts, plus a
+# process-wide registry that exports totals across sessions.
+
+# tracemalloc is process-wide and slows every allocation, so it only runs
+# while at least one stage is tracing (unless it was already on at startup)
+_tracing_lock = threading.Lock()
+_tracing_stages = 0
+_tracing_started = False
+
+
+def _start_tracing():
+    global _tracing_stages, _tracing_started
+    with _tracing_lock:
+        if _tracing_stages == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_stages += 1
+
+
+def _stop_tracing():
+    global _tracing_stages, _tracing_started
+    with _tracing_lock:
+        _tracing_stages -= 1
+        if _tracing_stages == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+# Stage records of one script run
+class RunMetrics:
+    def __init__(self, session_id=None, trace_memory=False):
+        self.session_id = session_id
+        self.run_id = uuid.uuid4().hex
+        self.started = time.time()
+        self._clock = time.perf_counter()
+        self.trace_memory = trace_memory
+        self.records = []
+
+    # Time a stage. The yielded record can be updated with rows_out (and
+    # anything else) inside the block. With trace_memory, allocated_bytes is
+    # tracemalloc's peak during the stage; tracemalloc is process-wide, so
+    # concurrent sessions inflate each other's numbers.
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        record = {'stage': name, 'rows_in': rows_in, 'rows_out': None, 'seconds': None, 'allocated_bytes': None}
+        if self.trace_memory:
+            _start_tracing()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            if self.trace_memory:
+                record['allocated_bytes'] = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+                _stop_tracing()
+            self.records.append(record)
+
+    # Stage time summed; stages run concurrently on the panel pool, so this
+    # can exceed the run's wall time
+    @property
+    def total_seconds(self):
+        return sum(r['seconds'] for r in self.records)
+
+    # Wall time since the run started
+    @property
+    def elapsed_seconds(self):
+        return time.perf_counter() - self._clock
+
+    def to_json_lines(self):
+        base = {'run_id': self.run_id, 'session_id': self.session_id, 'timestamp': self.started}
+        return ''.join(json.dumps({**base, **record}) + '\n' for record in self.records)
+
+
+# Cumulative per-stage counters across all sessions of the process
+class MetricsRegistry:
+    def __init__(self, log_path=None, prometheus_path=None):
+        self.log_path = log_path
+        self.prometheus_path = prometheus_path
+        self._lock = threading.RLock()
+        self._runs = 0
+        self._stages = {}
+
+    def observe(self, run):
+        with self._lock:
+            self._runs += 1
+            for record in run.records:
+                totals = self._stages.setdefault(
+                    record['stage'], {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'rows_out': 0, 'allocated_bytes': 0}
+                )
+                totals['count'] += 1
+                totals['seconds'] += record['seconds']
+                totals['max_seconds'] = max(totals['max_seconds'], record['seconds'])
+                totals['rows_out'] += record['rows_out'] or 0
+                totals['allocated_bytes'] += record['allocated_bytes'] or 0
+
+            if self.log_path:
+                with open(self.log_path, 'a') as log:
+                    log.write(run.to_json_lines())
+            if self.prometheus_path:
+                self._write_prometheus()
+
+    def stages(self):
+        with self._lock:
+            return {name: dict(totals) for name, totals in self._stages.items()}
+
+    # Prometheus text exposition format
+    def prometheus_text(self):
+        with self._lock:
+            lines = [
+                '# HELP dashboard_runs_total Script runs observed.',
+                '# TYPE dashboard_runs_total counter',
+                f'dashboard_runs_total {self._runs}',
+            ]
+            series = [
+                ('dashboard_stage_runs_total', 'counter', 'Times the stage ran.', 'count'),
+                ('dashboard_stage_seconds_total', 'counter', 'Wall time spent in the stage.', 'seconds'),
+                ('dashboard_stage_seconds_max', 'gauge', 'Slowest single run of the stage.', 'max_seconds'),
+                ('dashboard_stage_rows_out_total', 'counter', 'Rows produced by the stage.', 'rows_out'),
+                ('dashboard_stage_allocated_bytes_total', 'counter', 'Peak traced allocations of the stage.', 'allocated_bytes'),
+            ]
+            for metric, kind, help_text, field in series:
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} {kind}')
+                for name, totals in sorted(self._stages.items()):
+                    label = name.replace('\\', '\\\\').replace('"', '\\"')
+                    lines.append(f'{metric}{{stage="{label}"}} {totals[field]}')
+            return '\n'.join(lines) + '\n'
+
+    # Written for node_exporter's textfile collector; replaced atomically
+    def _write_prometheus(self):
+        tmp_path = f"{self.prometheus_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as out:
+            out.write(self.prometheus_text())
+        os.replace(tmp_path, self.prometheus_path)
@@ -0,0 +1,45 @@
+from concurrent.futures import CancelledError, as_completed
+
+# Concurrent figure building for one script run. Builds are submitted to a
+# process-wide pool as soon as their inputs exist; the script reserves a
+# placeholder per panel while laying out the page, then fills placeholders
+# in completion order. Streamlit calls stay on the script thread.
+
+
+class PanelRun:
+    def __init__(self, executor):
+        self.executor = executor
+        self.futures = {}
+        self.slots = []
+
+    def submit(self, name, fn, *args, **kwargs):
+        self.futures[name] = self.executor.submit(fn, *args, **kwargs)
+        return self.futures[name]
+
+    # Reserve the panel's place in the layout
+    def slot(self, container, name, **render_kwargs):
+        placeholder = container.empty()
+        self.slots.append((name, placeholder, render_kwargs))
+        return placeholder
+
+    # Fill placeholders as builds finish. A superseding rerun raises out of
+    # the next Streamlit call; builds that haven't started are then cancelled.
+    def render(self, draw):
+        pending = {self.futures[name]: (name, placeholder, kwargs) for name, placeholder, kwargs in self.slots}
+        try:
+            for future in as_completed(pending):
+                name, placeholder, kwargs = pending[future]
+                try:
+                    fig = future.result()
+                except CancelledError:
+                    continue
+                except Exception as error:
+                    placeholder.error(f"Couldn't build the '{name}' chart: {error}")
+                    continue
+                draw(placeholder, name, fig, **kwargs)
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        for future in self.futures.values():
+            future.cancel()
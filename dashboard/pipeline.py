@@ -0,0 +1,93 @@
+from dashboard import charts
+from dashboard.cube import CubeLayout
+from dashboard.filters import FilterIndex, Query
+from dashboard.schema import add_derived_columns
+from dashboard.sources import load_dataset
+
+# The dashboard's load -> filter -> aggregate -> figure pipeline, callable
+# without a Streamlit server. app.py renders the same FIGURES.
+
+# Rendering options with their defaults
+DEFAULT_OPTIONS = {
+    'scatter_max_points': 5000,
+    'scatter_mode': 'sample',
+}
+
+
+# Figure name -> (builder, required columns, builder arguments from (cube, dataset, selected rows, options))
+FIGURES = {
+    'stock_levels': (
+        charts.total_gauge, ['Stock levels'],
+        lambda cube, data, rows, opts: (cube.total('Stock levels'), "Current Stock Levels", "rgba(31, 119, 180, 0.8)"),
+    ),
+    'lead_times': (
+        charts.total_gauge, ['Lead times'],
+        lambda cube, data, rows, opts: (cube.total('Lead times'), "Current Lead Times", "rgba(180, 119, 31, 0.8)"),
+    ),
+    'cost_revenue_scatter': (
+        charts.cost_revenue_scatter, ['Manufacturing costs', 'Revenue generated'],
+        lambda cube, data, rows, opts: (data, rows, opts['scatter_max_points'], opts['scatter_mode']),
+    ),
+    'revenue_by_product': (
+        charts.revenue_by_product_bar, ['Product type', 'Revenue generated'],
+        lambda cube, data, rows, opts: (cube.rollup('Product type', ['Revenue generated']),),
+    ),
+    'revenue_by_location': (
+        charts.revenue_by_location_pie, ['Revenue generated', 'Location'],
+        lambda cube, data, rows, opts: (cube.rollup('Location', ['Revenue generated']),),
+    ),
+    'cost_by_supplier': (
+        charts.cost_by_supplier_pie, ['Manufacturing costs', 'Supplier name'],
+        lambda cube, data, rows, opts: (cube.rollup('Supplier name', ['Manufacturing costs']),),
+    ),
+    'price_vs_cost': (
+        charts.price_cost_bar, ['Price', 'Manufacturing costs', 'Product type'],
+        lambda cube, data, rows, opts: (cube.rollup('Product type', ['Price', 'Manufacturing costs'], how='mean'),),
+    ),
+    'cost_inspection_results': (
+        charts.inspection_cost_pie, ['Inspection results', 'Manufacturing costs'],
+        lambda cube, data, rows, opts: (cube.rollup('Inspection results', ['Manufacturing costs']),),
+    ),
+    'order_quantities_location': (
+        charts.orders_by_location_bar, ['Location', 'Order quantities'],
+        lambda cube, data, rows, opts: (cube.rollup('Location', ['Order quantities']),),
+    ),
+    'order_quantities_transportation_mode': (
+        charts.orders_by_transport_pie, ['Transportation modes', 'Order quantities'],
+        lambda cube, data, rows, opts: (cube.rollup('Transportation modes', ['Order quantities']),),
+    ),
+}
+
+
+# Builder and its arguments for one figure
+def figure_inputs(name, cube, data, rows, options=None):
+    builder, _, inputs = FIGURES[name]
+    return builder, inputs(cube, data, rows, {**DEFAULT_OPTIONS, **(options or {})})
+
+
+def build_figure(name, cube, data, rows, options=None):
+    builder, args = figure_inputs(name, cube, data, rows, options)
+    return builder(*args)
+
+
+# Figures whose required columns exist in the dataset
+def available_figures(columns):
+    return [name for name, (_, required, _) in FIGURES.items() if all(col in columns for col in required)]
+
+
+# Dataset-level structures: filter index and cube layout
+def build_indexes(df):
+    return FilterIndex(df), CubeLayout(df)
+
+
+# One pass of the pipeline. Returns the cube, selected rows and built figures.
+def run(df, query=None, options=None, indexes=None, figures=None):
+    filter_index, layout = indexes or build_indexes(df)
+    rows = filter_index.evaluate(query or Query())
+    cube = layout.aggregate(df, rows)
+    names = figures if figures is not None else available_figures(df.columns)
+    return cube, rows, {name: build_figure(name, cube, df, rows, options) for name in names}
+
+
+def run_source(source, query=None, options=None):
+    return run(add_derived_columns(load_dataset(source)), query, options)
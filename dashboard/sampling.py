@@ -0,0 +1,55 @@
+import numpy as np
+
+from dashboard.filters import column_codes
+
+
+# How far each point lies outside the 1.5 * IQR fences (0 inside), per axis, summed
+def outlier_scores(*columns):
+    score = np.zeros(len(columns[0]))
+    for values in columns:
+        q1, q3 = np.nanpercentile(values, [25, 75])
+        spread = (q3 - q1) or 1.0
+        low, high = q1 - 1.5 * spread, q3 + 1.5 * spread
+        score += (np.clip(low - values, 0, None) + np.clip(values - high, 0, None)) / spread
+    return np.nan_to_num(score)
+
+
+# Up to n rows sampled proportionally from every group of `by`; each
+# non-empty group keeps at least one row. Returns sorted row positions.
+def stratified_sample(df, by, n, seed=0):
+    if len(df) <= n:
+        return np.arange(len(df))
+    codes, _ = column_codes(df[by]) if by in df.columns else (np.zeros(len(df), dtype=np.int64), None)
+    codes = codes.astype(np.int64) + 1  # missing values become their own group
+
+    sizes = np.bincount(codes)
+    quotas = np.where(sizes > 0, np.maximum(1, np.floor(sizes * n / len(df))), 0).astype(np.int64)
+
+    # Random rank of every row inside its group, then keep rank < quota
+    keys = np.random.default_rng(seed).random(len(df))
+    order = np.lexsort((keys, codes))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.arange(len(df)) - starts[codes[order]]
+    return np.sort(order[rank < quotas[codes[order]]])
+
+
+# Rows kept when thinning a scatter: the most extreme outliers (up to half
+# the budget) plus a stratified sample per `by` group for the rest.
+def reduce_points(df, x, y, by, max_points, seed=0):
+    if len(df) <= max_points:
+        return np.arange(len(df))
+    scores = outlier_scores(df[x].to_numpy(dtype=np.float64), df[y].to_numpy(dtype=np.float64))
+    outliers = np.flatnonzero(scores > 0)
+    if len(outliers) > max_points // 2:
+        outliers = outliers[np.argsort(scores[outliers])[-(max_points // 2):]]
+    sample = stratified_sample(df, by, max_points - len(outliers), seed)
+    return np.union1d(sample, outliers)
+
+
+# 2D histogram of (x, y) for density mode; returns (counts, x_centers, y_centers)
+def density_grid(df, x, y, bins=60):
+    xs = df[x].to_numpy(dtype=np.float64)
+    ys = df[y].to_numpy(dtype=np.float64)
+    valid = ~(np.isnan(xs) | np.isnan(ys))
+    counts, x_edges, y_edges = np.histogram2d(xs[valid], ys[valid], bins=bins)
+    return counts.T, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
@@ -0,0 +1,107 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Storage types for the supply-chain columns:
+#   'category' - low-cardinality dimension, stored as integer codes
+#   'integer'  - smallest signed integer type that holds the values
+#   'float32'  - measures with a few significant digits (prices, rates)
+#   'float64'  - money columns that are summed into to-the-cent totals
+# Columns not listed keep the type they were read with.
+SCHEMA = {
+    'Product type': 'category',
+    'Price': 'float32',
+    'Availability': 'integer',
+    'Number of products sold': 'integer',
+    'Revenue generated': 'float64',
+    'Customer demographics': 'category',
+    'Stock levels': 'integer',
+    'Lead times': 'integer',
+    'Order quantities': 'integer',
+    'Shipping times': 'integer',
+    'Shipping carriers': 'category',
+    'Shipping costs': 'float32',
+    'Supplier name': 'category',
+    'Location': 'category',
+    'Production volumes': 'integer',
+    'Manufacturing lead time': 'integer',
+    'Manufacturing costs': 'float32',
+    'Inspection results': 'category',
+    'Defect rates': 'float32',
+    'Transportation modes': 'category',
+    'Routes': 'category',
+    'Costs': 'float32',
+}
+
+CATEGORICAL_COLUMNS = [col for col, kind in SCHEMA.items() if kind == 'category']
+
+# Unlisted text columns with at most this share of distinct values become categoricals
+AUTO_CATEGORY_RATIO = 0.5
+
+
+# Convert one column to its schema type; values that don't fit are left alone
+def convert_column(series, kind):
+    if kind == 'category':
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    if not pd.api.types.is_numeric_dtype(series.dtype):
+        return series
+    if kind == 'integer':
+        if pd.api.types.is_integer_dtype(series.dtype):
+            return pd.to_numeric(series, downcast='integer')
+        return series  # floats or NaNs: not safely integral
+    if kind == 'float32':
+        finite = series.abs().max()
+        if pd.isna(finite) or finite < np.finfo(np.float32).max:
+            return series.astype(np.float32)
+        return series
+    if kind == 'float64':
+        return series.astype(np.float64)
+    return series
+
+
+# Apply SCHEMA to a frame (plus auto-categorizing repetitive unlisted text columns)
+def apply_schema(df, schema=SCHEMA):
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        kind = schema.get(col)
+        if kind is None and len(series) and (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)) \
+                and not isinstance(series.dtype, pd.CategoricalDtype) \
+                and series.nunique() <= AUTO_CATEGORY_RATIO * len(series):
+            kind = 'category'
+        columns[col] = convert_column(series, kind) if kind else series
+    return pd.DataFrame(columns, index=df.index)
+
+
+# Bytes a column would take as read naively (object strings, 64-bit numbers)
+def naive_bytes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = np.asarray(series.cat.codes)
+        per_value = np.array([sys.getsizeof(value) for value in series.cat.categories], dtype=np.int64)
+        counts = np.bincount(codes[codes >= 0], minlength=len(per_value))
+        return int(len(series) * 8 + counts @ per_value)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return len(series) * 8
+    return int(series.memory_usage(index=False, deep=True))
+
+
+# Per-column memory of the frame against the naive representation
+def memory_report(df):
+    report = pd.DataFrame({
+        'column': df.columns,
+        'dtype': [str(dtype) for dtype in df.dtypes],
+        'naive_bytes': [naive_bytes(df[col]) for col in df.columns],
+        'bytes': [int(df[col].memory_usage(index=False, deep=True)) for col in df.columns],
+    })
+    report['saved_bytes'] = report['naive_bytes'] - report['bytes']
+    report['saved_pct'] = (100 * report['saved_bytes'] / report['naive_bytes'].where(report['naive_bytes'] > 0)).round(1)
+    return report
+
+
+# Columns derived once when the dataset is loaded, never per session
+def add_derived_columns(df):
+    if 'Price' in df.columns and 'Manufacturing costs' in df.columns:
+        price = df['Price'].astype(np.float64)
+        df = df.assign(**{'Profit Margin (%)': ((price - df['Manufacturing costs']) / price * 100).astype(np.float32)})
+    return df
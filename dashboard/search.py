@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import column_codes
+
+# Identifier columns the sidebar search box looks in
+SEARCH_COLUMNS = ['SKU', 'Supplier name', 'Shipping carriers', 'Routes']
+
+# Substring matching uses n-grams of this length; shorter queries are
+# matched through the grams that contain them
+GRAM = 3
+
+# Bits per code point in a packed gram
+CODE_BITS = 21
+
+
+def grams(text, n=GRAM):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+# Pack a 3-character gram into one int64 (21 bits per code point)
+def encode_gram(gram):
+    return (ord(gram[0]) << 42) | (ord(gram[1]) << 21) | ord(gram[2])
+
+
+# Code points of packed grams, one array per position in the gram
+def decode_grams(codes):
+    mask = (1 << CODE_BITS) - 1
+    return [(codes >> (CODE_BITS * (GRAM - 1 - i))) & mask for i in range(GRAM)]
+
+
+# Concatenated aranges start:stop for every pair, in one go
+def gather_ranges(starts, stops):
+    lengths = stops - starts
+    return np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths) + np.arange(lengths.sum())
+
+
+# Every (gram code, term id) occurrence of a fixed-width str array, vectorized
+def term_grams(terms):
+    if not len(terms) or terms.dtype.itemsize // 4 < GRAM:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    width = terms.dtype.itemsize // 4
+    chars = terms.view(np.uint32).reshape(len(terms), width).astype(np.int64)
+    lengths = np.char.str_len(terms)
+    codes, owners = [], []
+    for i in range(width - GRAM + 1):
+        valid = np.flatnonzero(lengths >= i + GRAM)
+        codes.append((chars[valid, i] << 42) | (chars[valid, i + 1] << 21) | chars[valid, i + 2])
+        owners.append(valid)
+    return np.concatenate(codes), np.concatenate(owners)
+
+
+# Row mask of a frame whose identifier columns match the text, by the same
+# rules as SearchIndex but without an index (for rows that are seen once)
+def search_mask(df, text, columns=SEARCH_COLUMNS):
+    text = text.strip().lower()
+    mask = np.zeros(len(df), dtype=bool)
+    if not text:
+        return mask
+    for column in columns:
+        if column not in df.columns:
+            continue
+        codes, values = column_codes(df[column])
+        terms = pd.Index(values).astype(str).str.lower()
+        hits = terms.str.contains(text, regex=False)
+        mask |= np.isin(codes, np.flatnonzero(np.asarray(hits, dtype=bool)))
+    return mask
+
+
+# Prebuilt search over the distinct values ("terms") of the identifier
+# columns: a trigram inverted index for substring queries (shorter queries
+# go through the trigrams containing them) and a term -> rows posting table.
+class SearchIndex:
+    def __init__(self, df, columns=SEARCH_COLUMNS):
+        self.n_rows = len(df)
+        terms = []
+        n_terms = 0
+        term_ids = []
+        row_ids = []
+        for column in columns:
+            if column not in df.columns:
+                continue
+            codes, values = column_codes(df[column])
+            present = codes >= 0
+            term_ids.append(codes[present].astype(np.int64) + n_terms)
+            n_terms += len(values)
+            row_ids.append(np.flatnonzero(present))
+            terms.append(pd.Index(values).astype(str).str.lower().to_numpy(dtype=str))
+
+        # Rows of term t are rows[offsets[t]:offsets[t + 1]]
+        term_ids = np.concatenate(term_ids) if term_ids else np.empty(0, dtype=np.int64)
+        row_ids = np.concatenate(row_ids) if row_ids else np.empty(0, dtype=np.int64)
+        order = np.argsort(term_ids, kind='stable')
+        self.rows = row_ids[order]
+        self.offsets = np.searchsorted(term_ids[order], np.arange(n_terms + 1))
+
+        self.terms = np.concatenate(terms) if terms else np.empty(0, dtype=str)
+        # Terms without a single gram, checked directly by short queries
+        self.short_terms = np.flatnonzero(np.char.str_len(self.terms) < GRAM)
+
+        # Inverted index as CSR: terms containing gram g are
+        # gram_terms[gram_offsets[i]:gram_offsets[i + 1]] where gram_codes[i] == g
+        codes, owners = term_grams(self.terms)
+        order = np.lexsort((owners, codes))
+        codes, owners = codes[order], owners[order]
+        first = np.ones(len(codes), dtype=bool)  # drop a gram repeated within one term
+        first[1:] = (codes[1:] != codes[:-1]) | (owners[1:] != owners[:-1])
+        codes, owners = codes[first], owners[first]
+        new_gram = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+        self.gram_codes = codes[new_gram]
+        self.gram_offsets = np.append(new_gram, len(codes))
+        self.gram_terms = owners
+        self.gram_chars = decode_grams(self.gram_codes)
+
+    def _postings(self, gram):
+        i = np.searchsorted(self.gram_codes, encode_gram(gram))
+        if i == len(self.gram_codes) or self.gram_codes[i] != encode_gram(gram):
+            return None
+        return self.gram_terms[self.gram_offsets[i]:self.gram_offsets[i + 1]]
+
+    # Terms containing a text shorter than a gram: the terms of every gram
+    # that contains it, plus matching terms too short to have grams
+    def _match_short(self, text):
+        chars = [ord(char) for char in text]
+        hit = np.zeros(len(self.gram_codes), dtype=bool)
+        for offset in range(GRAM - len(chars) + 1):
+            hit |= np.logical_and.reduce([self.gram_chars[offset + i] == char for i, char in enumerate(chars)])
+        grams_hit = np.flatnonzero(hit)
+        found = np.zeros(len(self.terms), dtype=bool)
+        found[self.gram_terms[gather_ranges(self.gram_offsets[grams_hit], self.gram_offsets[grams_hit + 1])]] = True
+        short = self.short_terms
+        found[short[np.char.find(self.terms[short], text) >= 0]] = True
+        return np.flatnonzero(found)
+
+    # Ids of terms containing the text
+    def match_terms(self, text):
+        text = text.strip().lower()
+        if not text:
+            return np.empty(0, dtype=np.int64)
+        if len(text) < GRAM:
+            return self._match_short(text)
+
+        lists = []
+        for gram in grams(text):
+            ids = self._postings(gram)
+            if ids is None:
+                return np.empty(0, dtype=np.int64)
+            lists.append(ids)
+        lists.sort(key=len)
+
+        # Probe the shortest posting list against the others (all sorted)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            found = np.searchsorted(ids, candidates)
+            candidates = candidates[ids[np.minimum(found, len(ids) - 1)] == candidates]
+            if not len(candidates):
+                return candidates
+        if len(text) == GRAM:
+            return candidates
+        # Grams can all occur without the whole text occurring
+        return candidates[np.char.find(self.terms[candidates], text) >= 0]
+
+    # Sorted row positions whose identifier columns match the text
+    def search(self, text):
+        term_ids = self.match_terms(text)
+        if not len(term_ids):
+            return np.empty(0, dtype=np.int64)
+        # Gather every posting range in one go, then dedupe through a row mask
+        positions = gather_ranges(self.offsets[term_ids], self.offsets[term_ids + 1])
+        hits = np.zeros(self.n_rows, dtype=bool)
+        hits[self.rows[positions]] = True
+        return np.flatnonzero(hits)
@@ -0,0 +1,129 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from dashboard.schema import AUTO_CATEGORY_RATIO, CATEGORICAL_COLUMNS, SCHEMA, apply_schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # snapshots are an optimisation, plain CSV still works
+    pa = None
+    feather = None
+
+# Bundled extract shipped next to app.py
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "supply_chain_data.csv")
+
+# Where typed columnar snapshots of text sources are written
+SNAPSHOT_DIR = os.environ.get("DASHBOARD_SNAPSHOT_DIR", os.path.join(os.path.dirname(DEFAULT_SOURCE), ".snapshots"))
+
+
+# Parse a CSV with the dimension columns typed as categoricals
+def read_csv(path):
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: 'category' for col in CATEGORICAL_COLUMNS if col in header}
+    return pd.read_csv(path, dtype=dtypes)
+
+
+def read_parquet(path):
+    return pd.read_parquet(path)
+
+
+def read_feather(path):
+    if feather is None:
+        return pd.read_feather(path)
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+# Arrow IPC file, memory-mapped so pages are only touched when read
+def read_arrow(path):
+    if pa is None:
+        raise ImportError("pyarrow is required to read Arrow IPC files")
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas()
+
+
+# File extension -> reader; extend with register_reader()
+READERS = {
+    '.csv': read_csv,
+    '.parquet': read_parquet,
+    '.feather': read_feather,
+    '.arrow': read_arrow,
+}
+
+# Formats that are parsed from text and therefore worth snapshotting
+TEXT_FORMATS = {'.csv'}
+
+
+def register_reader(extension, reader, text=False):
+    READERS[extension.lower()] = reader
+    if text:
+        TEXT_FORMATS.add(extension.lower())
+
+
+# Short digest of whatever shapes a derived file's content (column types,
+# view definitions, ...). It is part of the file name, so changing any of
+# them invalidates files written before.
+def format_tag(*parts):
+    return hashlib.blake2b(repr(parts).encode(), digest_size=4).hexdigest()
+
+
+# Uncompressed, so reads map the file: numeric columns are used in place
+# and pages are only loaded when touched (compressed buffers would have to
+# be decompressed onto the heap)
+SNAPSHOT_COMPRESSION = 'uncompressed'
+
+SNAPSHOT_FORMAT = format_tag(SCHEMA, AUTO_CATEGORY_RATIO, SNAPSHOT_COMPRESSION)
+
+
+# Snapshot file name changes whenever the source file or the schema does
+def snapshot_path(path, snapshot_dir=SNAPSHOT_DIR):
+    stat = os.stat(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(snapshot_dir, f"{name}-{stat.st_size}-{stat.st_mtime_ns}.{SNAPSHOT_FORMAT}.feather")
+
+
+def write_snapshot(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    feather.write_feather(df, tmp_path, compression=SNAPSHOT_COMPRESSION)
+    os.replace(tmp_path, path)
+    remove_stale(path, '.feather')
+
+
+# Drop files (snapshots, views) left behind by older versions of the same source
+def remove_stale(path, suffix):
+    prefix = os.path.basename(path).rsplit('-', 2)[0] + '-'
+    for entry in os.scandir(os.path.dirname(path)):
+        if entry.name.startswith(prefix) and entry.name.endswith(suffix) and entry.path != path:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+# Load a local dataset with the compact SCHEMA types, reusing a typed
+# columnar snapshot for text formats
+def load_dataset(path=DEFAULT_SOURCE, snapshot_dir=SNAPSHOT_DIR):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Unsupported data source format: {extension or path}")
+
+    if extension not in TEXT_FORMATS or feather is None:
+        return apply_schema(READERS[extension](path))
+
+    snapshot = snapshot_path(path, snapshot_dir)
+    if os.path.exists(snapshot):
+        try:
+            return read_feather(snapshot)
+        except (OSError, pa.ArrowInvalid):
+            pass  # truncated or corrupt snapshot, rebuild it below
+
+    df = apply_schema(READERS[extension](path))
+    try:
+        write_snapshot(df, snapshot)
+    except OSError:
+        pass  # read-only deployments still get the parsed frame
+    return df
@@ -0,0 +1,300 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from dashboard.cube import CUBE_DIMENSIONS, CUBE_MEASURES, CubeLayout
+from dashboard.filters import CATEGORY_FILTERS, RANGE_FILTERS, Query, column_codes
+from dashboard.logistics import LANE_DIMENSIONS, LANE_MEASURES
+from dashboard.schema import CATEGORICAL_COLUMNS, apply_schema
+from dashboard.search import SEARCH_COLUMNS, search_mask
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV sources still stream through pandas
+    pa = None
+    pq = None
+
+# Out-of-core execution: the source is read one chunk (CSV), record batch
+# (Arrow/Feather) or row group (Parquet) at a time, filtered, and folded
+# into a running cube, so memory stays bounded by the chunk size plus the
+# occupied cube cells, never the dataset.
+
+# Rows per chunk for text sources; Arrow batches and Parquet row groups are read as written
+CHUNK_ROWS = int(os.environ.get("DASHBOARD_CHUNK_ROWS", "250000"))
+
+# Columns a streamed pass reads: cube dimensions and measures, filter and
+# search columns, and the lane columns kept in the row sample
+STREAM_COLUMNS = list(dict.fromkeys(
+    CUBE_DIMENSIONS + CUBE_MEASURES + CATEGORY_FILTERS + RANGE_FILTERS + SEARCH_COLUMNS + LANE_DIMENSIONS + LANE_MEASURES
+))
+
+
+def _extension(path):
+    return os.path.splitext(path)[1].lower()
+
+
+# Changes whenever the source file does; stands in for the store's data version
+def source_version(path):
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+# Column names of a source, read from its header or schema only
+def source_columns(path):
+    extension = _extension(path)
+    if extension == '.csv':
+        return list(pd.read_csv(path, nrows=0).columns)
+    if pa is None:
+        raise ImportError("pyarrow is required to stream Parquet/Feather/Arrow files")
+    if extension == '.parquet':
+        return list(pq.ParquetFile(path).schema_arrow.names)
+    with pa.memory_map(path, 'r') as source:
+        return list(pa.ipc.open_file(source).schema.names)
+
+
+# Typed frames of the given columns, one chunk at a time
+def iter_chunks(path, columns, chunk_rows=CHUNK_ROWS):
+    extension = _extension(path)
+    if extension == '.csv':
+        dtypes = {col: 'category' for col in CATEGORICAL_COLUMNS if col in columns}
+        with pd.read_csv(path, usecols=lambda col: col in columns, dtype=dtypes, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                yield apply_schema(chunk)
+        return
+    if pa is None:
+        raise ImportError("pyarrow is required to stream Parquet/Feather/Arrow files")
+    if extension == '.parquet':
+        source = pq.ParquetFile(path)
+        columns = [col for col in source.schema_arrow.names if col in columns]
+        for batch in source.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield apply_schema(batch.to_pandas())
+        return
+    if extension not in ('.feather', '.arrow'):
+        raise ValueError(f"Unsupported data source format: {extension or path}")
+    with pa.memory_map(path, 'r') as source:
+        reader = pa.ipc.open_file(source)
+        columns = [col for col in reader.schema.names if col in columns]
+        for i in range(reader.num_record_batches):
+            yield apply_schema(reader.get_batch(i).select(columns).to_pandas())
+
+
+# Sidebar domain of a source (filter options, slider bounds, row count and
+# a preview), from one streamed pass over the filter columns. Exposes the
+# same `options` and `bounds` as FilterIndex.
+class SourceDomain:
+    def __init__(self, path, chunk_rows=CHUNK_ROWS, preview_rows=1000):
+        self.columns = source_columns(path)
+        self.n_rows = 0
+        seen = {col: set() for col in CATEGORY_FILTERS if col in self.columns}
+        lows, highs = {}, {}
+        for chunk in iter_chunks(path, list(seen) + RANGE_FILTERS, chunk_rows):
+            self.n_rows += len(chunk)
+            for col, values in seen.items():
+                codes, levels = column_codes(chunk[col])
+                present = np.bincount(codes[codes >= 0], minlength=len(levels)) > 0
+                values.update(level for level, hit in zip(levels, present) if hit)
+            for col in RANGE_FILTERS:
+                if col in chunk.columns and chunk[col].notna().any():
+                    lows[col] = min(lows.get(col, np.inf), float(chunk[col].min()))
+                    highs[col] = max(highs.get(col, -np.inf), float(chunk[col].max()))
+        self.options = {col: sorted(values) for col, values in seen.items()}
+        self.bounds = {col: (lows[col], highs[col]) for col in lows}
+        self.preview = next(iter_chunks(path, self.columns, preview_rows), pd.DataFrame(columns=self.columns)).head(preview_rows)
+
+
+# Drop predicates that select the whole domain (every option, the full
+# range) so they neither cost a scan nor drop rows with missing values;
+# FilterIndex skips the same no-op predicates.
+def effective_query(query, domain=None):
+    if domain is None:
+        return query
+    categories = tuple(
+        (col, values) for col, values in query.categories
+        if col not in domain.options or not set(domain.options[col]) <= set(values)
+    )
+    ranges = tuple(
+        (col, (low, high)) for col, (low, high) in query.ranges
+        if col not in domain.bounds or low > domain.bounds[col][0] or high < domain.bounds[col][1]
+    )
+    return Query(categories, ranges)
+
+
+# Row mask of a frame for the query and search text
+def query_mask(df, query, search_text=''):
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in query.categories:
+        if col in df.columns:
+            mask &= df[col].isin(values).to_numpy()
+    for col, (low, high) in query.ranges:
+        if col in df.columns:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            mask &= (values >= low) & (values <= high)
+    if search_text.strip():
+        mask &= search_mask(df, search_text)
+    return mask
+
+
+# Parquet row group that cannot match, judged from its min/max statistics alone
+def _pruned_by_statistics(row_group, query):
+    stats = {}
+    for j in range(row_group.num_columns):
+        column = row_group.column(j)
+        if column.statistics is not None and column.statistics.has_min_max:
+            stats[column.path_in_schema] = column.statistics
+    try:
+        for col, (low, high) in query.ranges:
+            if col in stats and (stats[col].max < low or stats[col].min > high):
+                return True
+        for col, values in query.categories:
+            if col in stats and not any(stats[col].min <= value <= stats[col].max for value in values):
+                return True
+    except TypeError:  # statistics of a type the widget values don't compare with
+        return False
+    return False
+
+
+# Row group whose dictionary for a filtered column holds none of the selected values
+def _pruned_by_dictionary(table, query):
+    for col, values in query.categories:
+        if col not in table.column_names or not pa.types.is_dictionary(table.schema.field(col).type):
+            continue
+        present = set()
+        for chunk in table.column(col).chunks:
+            present.update(chunk.dictionary.to_pylist())
+        if not present & set(values):
+            return True
+    return False
+
+
+# Parquet with predicate pushdown: row groups are skipped on statistics,
+# then on the dictionaries of the filter columns, which are read first;
+# the remaining columns are only read for row groups with matching rows.
+def _parquet_matches(path, columns, query, search_text, scan):
+    source = pq.ParquetFile(path, read_dictionary=[col for col in CATEGORICAL_COLUMNS if col in columns])
+    columns = [col for col in source.schema_arrow.names if col in columns]
+    predicates = [col for col, _ in query.categories] + [col for col, _ in query.ranges]
+    if search_text.strip():
+        predicates += SEARCH_COLUMNS
+    predicates = [col for col in dict.fromkeys(predicates) if col in columns]
+    rest = [col for col in columns if col not in predicates]
+
+    for i in range(source.num_row_groups):
+        scan['chunks'] += 1
+        if _pruned_by_statistics(source.metadata.row_group(i), query):
+            scan['pruned'] += 1
+            continue
+        if not predicates:
+            chunk = apply_schema(source.read_row_group(i, columns=columns).to_pandas())
+            scan['rows_read'] += len(chunk)
+            yield chunk
+            continue
+
+        head = source.read_row_group(i, columns=predicates)
+        if _pruned_by_dictionary(head, query):
+            scan['pruned'] += 1
+            continue
+        head = apply_schema(head.to_pandas())
+        scan['rows_read'] += len(head)
+        mask = query_mask(head, query, search_text)
+        if not mask.any():
+            continue
+        chunk = head
+        if rest:
+            chunk = pd.concat([head, apply_schema(source.read_row_group(i, columns=rest).to_pandas())], axis=1)
+        yield chunk[mask][columns]
+
+
+# Frames of the rows matching the query, chunk by chunk
+def matching_chunks(path, query, search_text='', columns=STREAM_COLUMNS, chunk_rows=CHUNK_ROWS, scan=None):
+    scan = scan if scan is not None else {'chunks': 0, 'pruned': 0, 'rows_read': 0}
+    if _extension(path) == '.parquet' and pq is not None:
+        for chunk in _parquet_matches(path, columns, query, search_text, scan):
+            yield chunk
+        return
+    for chunk in iter_chunks(path, columns, chunk_rows):
+        scan['chunks'] += 1
+        scan['rows_read'] += len(chunk)
+        mask = query_mask(chunk, query, search_text)
+        if mask.any():
+            yield chunk[mask]
+
+
+# Empty frame carrying the levels and measure types of a cube layout
+def _layout_for(levels, integer_measures, measures):
+    frame = pd.DataFrame({
+        **{dim: pd.Categorical([], categories=values) for dim, values in levels.items()},
+        **{m: pd.Series([], dtype=np.int64 if m in integer_measures else np.float64) for m in measures},
+    })
+    return CubeLayout(frame)
+
+
+# Result of one streamed pass: the cube of the matching rows, a uniform
+# sample of them (for the scatter) and scan counters
+class StreamResult:
+    def __init__(self, cube, sample, scan):
+        self.cube = cube
+        self.sample = sample
+        self.scan = scan
+
+    @property
+    def n_rows(self):
+        return self.cube.n_rows
+
+
+# Stream the source once and aggregate the rows matching the query into a
+# cube equal to the in-memory CubeLayout.aggregate of the same selection.
+# Chunk cubes are merged with Cube.combine; new dimension levels grow the
+# layout as they appear, and levels end up sorted like a CSV load.
+def stream_query(path, query=None, search_text='', domain=None, sample_size=5000, chunk_rows=CHUNK_ROWS, seed=0):
+    query = effective_query(query or Query(), domain)
+    available = domain.columns if domain is not None else source_columns(path)
+    columns = [col for col in STREAM_COLUMNS if col in available]
+    dimensions = [dim for dim in CUBE_DIMENSIONS if dim in columns]
+    measures = [m for m in CUBE_MEASURES if m in columns]
+
+    levels = {dim: [] for dim in dimensions}
+    integer_measures = set(measures)
+    layout = _layout_for(levels, integer_measures, measures)
+    cube = None
+    rng = np.random.default_rng(seed)
+    sample, sample_keys = None, None
+    scan = {'chunks': 0, 'pruned': 0, 'rows_read': 0}
+
+    for chunk in matching_chunks(path, query, search_text, columns, chunk_rows, scan):
+        # Grow the layout when the chunk brings new levels or non-integer measures
+        grown = False
+        for dim in dimensions:
+            codes, values = column_codes(chunk[dim])
+            known = set(levels[dim])
+            new = [value for value in values if value not in known]
+            if new:
+                levels[dim] = levels[dim] + new
+                grown = True
+        integer = {m for m in integer_measures if pd.api.types.is_integer_dtype(chunk[m].dtype)}
+        if integer != integer_measures:
+            integer_measures = integer
+            grown = True
+        if grown:
+            layout = _layout_for(levels, integer_measures, measures)
+            if cube is not None:
+                cube = cube.relayout(layout)
+
+        part = layout.aggregate_frame(chunk)
+        cube = part if cube is None else cube.combine(part)
+
+        # Bottom-k random keys: a uniform sample without replacement across chunks
+        keys = rng.random(len(chunk))
+        if sample is not None:
+            chunk = pd.concat([sample, chunk], ignore_index=True)
+            keys = np.concatenate([sample_keys, keys])
+        if len(keys) > sample_size:
+            keep = np.sort(np.argpartition(keys, sample_size)[:sample_size])
+            chunk, keys = chunk.take(keep), keys[keep]
+        sample, sample_keys = chunk.reset_index(drop=True), keys
+
+    final = _layout_for({dim: sorted(values) for dim, values in levels.items()}, integer_measures, measures)
+    cube = final.aggregate_frame(pd.DataFrame(columns=columns)) if cube is None else cube.relayout(final)
+    sample = apply_schema(sample) if sample is not None else pd.DataFrame(columns=columns)
+    return StreamResult(cube, sample, scan)
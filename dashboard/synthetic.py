@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# Synthetic supply-chain rows with the same 23 columns as
+# supply_chain_data.csv, for benchmarks and load tests.
+
+# Dimension column -> levels
+LEVELS = {
+    'Product type': ['cosmetics', 'haircare', 'skincare'],
+    'Customer demographics': ['Female', 'Male', 'Non-binary', 'Unknown'],
+    'Shipping carriers': ['Carrier A', 'Carrier B', 'Carrier C'],
+    'Supplier name': ['Supplier 1', 'Supplier 2', 'Supplier 3', 'Supplier 4', 'Supplier 5'],
+    'Location': ['Bangalore', 'Chennai', 'Delhi', 'Kolkata', 'Mumbai'],
+    'Inspection results': ['Fail', 'Pass', 'Pending'],
+    'Transportation modes': ['Air', 'Rail', 'Road', 'Sea'],
+    'Routes': ['Route A', 'Route B', 'Route C'],
+}
+
+# Measure column -> (low, high, integer?) matching the bundled extract's ranges
+RANGES = {
+    'Price': (1.0, 100.0, False),
+    'Availability': (1, 100, True),
+    'Number of products sold': (8, 1000, True),
+    'Revenue generated': (1000.0, 10000.0, False),
+    'Stock levels': (0, 100, True),
+    'Lead times': (1, 30, True),
+    'Order quantities': (1, 100, True),
+    'Shipping times': (1, 10, True),
+    'Shipping costs': (1.0, 10.0, False),
+    'Production volumes': (100, 1000, True),
+    'Manufacturing lead time': (1, 30, True),
+    'Manufacturing costs': (1.0, 100.0, False),
+    'Defect rates': (0.0, 5.0, False),
+    'Costs': (100.0, 1000.0, False),
+}
+
+# Column order of supply_chain_data.csv
+COLUMNS = [
+    'Product type', 'SKU', 'Price', 'Availability', 'Number of products sold', 'Revenue generated',
+    'Customer demographics', 'Stock levels', 'Lead times', 'Order quantities', 'Shipping times',
+    'Shipping carriers', 'Shipping costs', 'Supplier name', 'Location', 'Production volumes',
+    'Manufacturing lead time', 'Manufacturing costs', 'Inspection results', 'Defect rates',
+    'Transportation modes', 'Routes', 'Costs',
+]
+
+
+# n_rows synthetic rows; SKUs are numbered from `start` so chunks don't collide
+def generate(n_rows, seed=0, start=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for column in COLUMNS:
+        if column == 'SKU':
+            data[column] = 'SKU' + pd.Series(np.arange(start, start + n_rows)).astype(str)
+        elif column in LEVELS:
+            levels = LEVELS[column]
+            codes = rng.integers(0, len(levels), n_rows, dtype=np.int8)
+            data[column] = pd.Categorical.from_codes(codes, categories=levels)
+        else:
+            low, high, integer = RANGES[column]
+            if integer:
+                data[column] = rng.integers(low, high + 1, n_rows)
+            else:
+                data[column] = rng.uniform(low, high, n_rows)
+    return pd.DataFrame(data, columns=COLUMNS)
+
+
+# Yield the rows in chunks, for datasets too large to hold at once
+def generate_chunks(n_rows, chunk_rows=1_000_000, seed=0):
+    for i, start in enumerate(range(0, n_rows, chunk_rows)):
+        yield generate(min(chunk_rows, n_rows - start), seed=seed + i, start=start)
+
+
+# Write n_rows synthetic rows to a CSV, Parquet or Feather file, chunk by chunk
+def write_dataset(path, n_rows, chunk_rows=1_000_000, seed=0):
+    if path.endswith('.csv'):
+        for i, chunk in enumerate(generate_chunks(n_rows, chunk_rows, seed)):
+            chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        return path
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in generate_chunks(n_rows, chunk_rows, seed):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                if path.endswith('.parquet'):
+                    writer = pq.ParquetWriter(path, table.schema)
+                else:
+                    writer = pa.ipc.new_file(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
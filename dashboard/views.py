@@ -0,0 +1,187 @@
+import json
+import os
+
+import pandas as pd
+
+from dashboard.cube import CUBE_DIMENSIONS, CUBE_MEASURES
+from dashboard.sources import SNAPSHOT_DIR, format_tag, remove_stale, snapshot_path
+
+# Materialized views: the dashboard's standard rollups, computed from a cube
+# when a dataset version is published and persisted next to the snapshot,
+# so the summary is a lookup instead of a scan.
+
+# View name -> (dimension, measures, sum or mean)
+VIEWS = {
+    'revenue_by_location': ('Location', ['Revenue generated'], 'sum'),
+    'revenue_by_product': ('Product type', ['Revenue generated'], 'sum'),
+    'costs_by_supplier': ('Supplier name', ['Manufacturing costs'], 'sum'),
+    'costs_by_inspection': ('Inspection results', ['Manufacturing costs'], 'sum'),
+    'orders_by_transport': ('Transportation modes', ['Order quantities'], 'sum'),
+    'orders_by_route': ('Routes', ['Order quantities'], 'sum'),
+    'orders_by_location': ('Location', ['Order quantities'], 'sum'),
+    'price_cost_by_product': ('Product type', ['Price', 'Manufacturing costs'], 'mean'),
+}
+
+# Dataset-wide KPIs kept with the views
+TOTALS = ['Revenue generated', 'Order quantities', 'Stock levels']
+MEANS = ['Lead times']
+
+# Part of the views file name: persisted views are rebuilt when any of the
+# definitions they are computed from change
+VIEWS_FORMAT = format_tag(VIEWS, TOTALS, MEANS, CUBE_DIMENSIONS, CUBE_MEASURES)
+
+
+# Names of the views a cube on this layout has the columns for
+def view_names(layout):
+    return [
+        name for name, (dim, measures, _) in VIEWS.items()
+        if dim in layout.dimensions and all(m in layout.measures for m in measures)
+    ]
+
+
+class MaterializedViews:
+    def __init__(self, n_rows, totals, means, views):
+        self.n_rows = n_rows
+        self.totals = totals
+        self.means = means
+        self.views = views
+
+    # Every view (and KPI) whose columns the cube has
+    @classmethod
+    def from_cube(cls, cube):
+        layout = cube.layout
+        views = {}
+        for name in view_names(layout):
+            dim, measures, how = VIEWS[name]
+            views[name] = cube.rollup(dim, measures, how=how)
+        totals = {m: cube.total(m) for m in TOTALS if m in layout.measures}
+        means = {m: cube.mean(m) for m in MEANS if m in layout.measures}
+        return cls(cube.n_rows, totals, means, views)
+
+    def to_json(self):
+        return json.dumps({
+            'n_rows': self.n_rows,
+            'totals': self.totals,
+            'means': self.means,
+            'views': {name: json.loads(view.to_json(orient='split', index=False)) for name, view in self.views.items()},
+        })
+
+    @classmethod
+    def from_json(cls, text):
+        payload = json.loads(text)
+        views = {
+            name: pd.DataFrame(view['data'], columns=view['columns'])
+            for name, view in payload['views'].items()
+        }
+        return cls(payload['n_rows'], payload['totals'], payload['means'], views)
+
+
+# Views file sitting next to the source's snapshot (same source and schema
+# key, plus the view definitions)
+def views_path(source, snapshot_dir=SNAPSHOT_DIR):
+    return snapshot_path(source, snapshot_dir)[:-len('.feather')] + f'.{VIEWS_FORMAT}.views.json'
+
+
+def read_views(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return MaterializedViews.from_json(f.read())
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_views(views, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(views.to_json())
+    os.replace(tmp_path, path)
+    remove_stale(path, '.views.json')
+
+
+# Views persisted for a source version if present and complete; otherwise
+# built from the cube and persisted (best effort: read-only deployments
+# just rebuild them)
+def materialize(cube, path=None):
+    views = read_views(path) if path else None
+    if views is None or any(name not in views.views for name in view_names(cube.layout)):
+        views = MaterializedViews.from_cube(cube)
+        if path:
+            try:
+                write_views(views, path)
+            except OSError:
+                pass
+    return views
+
+
+def _money(value):
+    return f"{'-' if value < 0 else ''}₹{abs(value):,.2f}"
+
+
+def _count(value):
+    return f"{value:,.0f}"
+
+
+# "**A** (x), **B** (y), ..." for a view, largest first
+def _ranked(view, measure, fmt, limit=8):
+    view = view.sort_values(measure, ascending=False, kind='stable')
+    ranked = ", ".join(f"**{level}** ({fmt(value)})" for level, value in zip(view.iloc[:limit, 0], view[measure].iloc[:limit]))
+    return ranked + (", …" if len(view) > limit else "")
+
+
+def _section(title, lines):
+    return [f"#### {title}", *lines, ""] if lines else []
+
+
+# Markdown summary of the views; every figure comes from the data
+def summary_markdown(views):
+    if not views.n_rows:
+        return "### Supply Chain Summary\n\nNo rows match the current filters."
+    v = views.views
+    totals, means = views.totals, views.means
+
+    kpis = []
+    if 'Revenue generated' in totals:
+        kpis.append(f"- **Total revenue** is **{_money(totals['Revenue generated'])}** across {views.n_rows:,} records.")
+    if 'Order quantities' in totals:
+        kpis.append(f"- **Order volumes** add up to **{_count(totals['Order quantities'])} units**.")
+    if 'Stock levels' in totals:
+        kpis.append(f"- **Availability** stands at **{_count(totals['Stock levels'])} units** in stock.")
+
+    operations = []
+    if 'Lead times' in means:
+        operations.append(f"- **Lead times** average **{means['Lead times']:,.2f} days**.")
+
+    products = []
+    if 'revenue_by_product' in v:
+        products.append(f"- **Revenue by Product Type:** {_ranked(v['revenue_by_product'], 'Revenue generated', _money)}.")
+    if 'price_cost_by_product' in v:
+        margins = v['price_cost_by_product'].assign(margin=lambda d: d['Price'] - d['Manufacturing costs'])
+        products.append(
+            "- **Average margin per unit (price − manufacturing cost):** "
+            f"{_ranked(margins[[margins.columns[0], 'margin']], 'margin', _money)}."
+        )
+
+    regions = []
+    if 'revenue_by_location' in v:
+        regions.append(f"- **Revenue by Location:** {_ranked(v['revenue_by_location'], 'Revenue generated', _money)}.")
+    if 'orders_by_location' in v:
+        regions.append(f"- **Order Quantities by Location:** {_ranked(v['orders_by_location'], 'Order quantities', _count)}.")
+    if 'orders_by_transport' in v:
+        regions.append(f"- **Order Quantities by Transportation Mode:** {_ranked(v['orders_by_transport'], 'Order quantities', _count)}.")
+    if 'orders_by_route' in v:
+        regions.append(f"- **Order Quantities by Route:** {_ranked(v['orders_by_route'], 'Order quantities', _count)}.")
+
+    costs = []
+    if 'costs_by_inspection' in v:
+        costs.append(f"- **Manufacturing Costs by Inspection Results:** {_ranked(v['costs_by_inspection'], 'Manufacturing costs', _money)}.")
+    if 'costs_by_supplier' in v:
+        costs.append(f"- **Manufacturing Costs by Supplier:** {_ranked(v['costs_by_supplier'], 'Manufacturing costs', _money)}.")
+
+    lines = ["### Supply Chain Summary", ""]
+    lines += _section("1. Overall Business Performance (KPIs)", kpis)
+    lines += _section("2. Operational Efficiency", operations)
+    lines += _section("3. Product Performance", products)
+    lines += _section("4. Regional and Logistic Trends", regions)
+    lines += _section("5. Cost Management and Quality Control", costs)
+    return "\n".join(lines)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import synthetic
+from dashboard.cube import CubeLayout
+from dashboard.schema import apply_schema
+
+
+@pytest.fixture(scope='module')
+def data():
+    df = apply_schema(synthetic.generate(2_000, seed=3))
+    df.loc[df.index[::11], 'Location'] = np.nan
+    df.loc[df.index[::13], 'Price'] = np.nan
+    return df
+
+
+def assert_same_cube(actual, expected):
+    assert actual.n_rows == expected.n_rows
+    for dim in expected.layout.dimensions:
+        for how in ('sum', 'mean'):
+            pd.testing.assert_frame_equal(
+                actual.rollup(dim, expected.layout.measures, how=how).set_index(dim).sort_index(),
+                expected.rollup(dim, expected.layout.measures, how=how).set_index(dim).sort_index(),
+                check_dtype=False, check_index_type=False,
+            )
+
+
+def test_combine_adds_and_subtracts_cells(data):
+    layout = CubeLayout(data)
+    rows = np.arange(len(data))
+    first, second = layout.aggregate(data, rows[:700]), layout.aggregate(data, rows[700:])
+    whole = layout.aggregate(data)
+    assert_same_cube(first.combine(second), whole)
+    assert_same_cube(whole.combine(second, sign=-1), first)
+
+
+def test_slice_matches_aggregating_the_filtered_rows(data):
+    layout = CubeLayout(data)
+    cube = layout.aggregate(data)
+    selection = (('Location', ('Mumbai', 'Delhi')), ('Product type', ('skincare',)))
+    mask = data['Location'].isin(['Mumbai', 'Delhi']) & (data['Product type'] == 'skincare')
+    assert_same_cube(cube.slice(selection), layout.aggregate(data, np.flatnonzero(mask.to_numpy())))
+
+
+def test_slice_with_every_level_keeps_missing_values(data):
+    cube = CubeLayout(data).aggregate(data)
+    every = (('Location', tuple(data['Location'].cat.categories)),)
+    assert cube.slice(every).n_rows == len(data)
+
+
+def test_relayout_onto_grown_levels(data):
+    head = data.iloc[:500]
+    grown = data.copy()
+    grown['Routes'] = grown['Routes'].cat.add_categories(['Route Z']).cat.reorder_categories(
+        ['Route Z', 'Route C', 'Route B', 'Route A'])
+    cube = CubeLayout(head).aggregate(head)
+    relaid = cube.relayout(CubeLayout(grown))
+    assert_same_cube(relaid, cube)
+    rest = np.arange(500, len(grown))
+    assert_same_cube(relaid.combine(relaid.layout.aggregate(grown, rest)), CubeLayout(grown).aggregate(grown))
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from dashboard import synthetic
+from dashboard.filters import FilterIndex, Query
+from dashboard.schema import apply_schema
+
+
+@pytest.fixture(scope='module')
+def data():
+    df = apply_schema(synthetic.generate(3_000, seed=5))
+    df.loc[df.index[::7], 'Location'] = np.nan
+    df['Manufacturing costs'] = df['Manufacturing costs'].astype(np.float64)
+    df.loc[df.index[::9], 'Manufacturing costs'] = np.nan
+    return df
+
+
+@pytest.fixture(scope='module')
+def index(data):
+    return FilterIndex(data)
+
+
+# The same query as chained pandas masks
+def pandas_rows(df, query, row_set=None):
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in query.categories:
+        present = set(df[col].dropna().unique())
+        if present <= set(values):
+            continue  # every value selected: no filter, missing values stay
+        mask &= df[col].isin(values).to_numpy()
+    for col, (low, high) in query.ranges:
+        values = df[col].to_numpy(dtype=np.float64)
+        if low <= np.nanmin(values) and np.nanmax(values) <= high:
+            continue  # range covers the whole column
+        mask &= (values >= low) & (values <= high)
+    if row_set is not None:
+        selected = np.zeros(len(df), dtype=bool)
+        selected[row_set] = True
+        mask &= selected
+    return np.flatnonzero(mask)
+
+
+QUERIES = [
+    Query(),
+    Query.from_widgets({'Product type': ['skincare']}),
+    Query.from_widgets({'Location': ['Mumbai', 'Delhi'], 'Transportation modes': ['Air', 'Rail']}),
+    Query.from_widgets({'Location': ['Bangalore', 'Chennai', 'Delhi', 'Kolkata', 'Mumbai']}),
+    Query.from_widgets(ranges={'Manufacturing costs': (20, 60)}),
+    Query.from_widgets(ranges={'Order quantities': (10, 50), 'Manufacturing costs': (0, 1_000)}),
+    Query.from_widgets({'Inspection results': ['Fail']}, {'Order quantities': (1, 30)}),
+    Query.from_widgets({'Product type': []}),
+    Query.from_widgets({'Location': ['Nowhere']}),
+    Query.from_widgets(ranges={'Manufacturing costs': (1_000, 2_000)}),
+]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_evaluate_matches_pandas_masks(data, index, query):
+    np.testing.assert_array_equal(index.evaluate(query), pandas_rows(data, query))
+
+
+@pytest.mark.parametrize('query', QUERIES[:4])
+def test_evaluate_within_a_row_set(data, index, query):
+    row_set = np.arange(0, len(data), 5)
+    np.testing.assert_array_equal(index.evaluate(query, row_set=row_set), pandas_rows(data, query, row_set))
+
+
+def test_empty_selection(index):
+    assert len(index.evaluate(Query.from_widgets({'Product type': []}))) == 0
+    assert len(index.evaluate(Query(), row_set=np.empty(0, dtype=np.int64))) == 0
+
+
+def test_options_and_bounds_ignore_missing_values(data, index):
+    assert index.options['Location'] == sorted(data['Location'].dropna().unique())
+    low, high = index.bounds['Manufacturing costs']
+    assert (low, high) == (data['Manufacturing costs'].min(), data['Manufacturing costs'].max())
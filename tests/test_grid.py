@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import synthetic
+from dashboard.grid import DataGrid
+from dashboard.schema import apply_schema
+
+PAGE_SIZE = 20
+
+
+@pytest.fixture(scope='module')
+def data():
+    df = apply_schema(synthetic.generate(5_000, seed=9))
+    df.loc[df.index[::7], 'Price'] = np.nan
+    df.loc[df.index[::5], 'Location'] = np.nan
+    return df
+
+
+@pytest.fixture(scope='module')
+def grid(data):
+    return DataGrid(data)
+
+
+# Reference page: pandas stable sort of the selection, missing values last
+# in row order. Descending pages list equal values in reverse row order.
+def expected_page(df, rows, sort, descending, page):
+    selected = df.take(rows)
+    if sort is not None:
+        missing = selected[sort].isna().to_numpy()
+        valid = selected[~missing]
+        if descending:
+            valid = valid.iloc[::-1]
+        valid = valid.sort_values(sort, ascending=not descending, kind='stable')
+        selected = pd.concat([valid, selected[missing]])
+    return selected.iloc[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+
+
+# Selections of each size take a different branch of _positions: every row
+# (a slice of the ordering), a large selection (scan of the ordering) and a
+# small one (sort by rank)
+SELECTIONS = {
+    'all': lambda n: np.arange(n),
+    'scan': lambda n: np.flatnonzero(np.arange(n) % 3 != 0),
+    'rank': lambda n: np.arange(5, n, 97),
+}
+
+
+@pytest.mark.parametrize('selection', list(SELECTIONS))
+@pytest.mark.parametrize('sort', [None, 'Price', 'Location', 'SKU'])
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('page', [0, 2, 160])
+def test_pages_match_pandas(data, grid, selection, sort, descending, page):
+    rows = SELECTIONS[selection](len(data))
+    window, total = grid.page(rows, sort, descending, page, PAGE_SIZE, key=selection)
+    assert total == len(rows)
+    expected = expected_page(data, rows, sort, descending, page)
+    np.testing.assert_array_equal(window.index.to_numpy(), expected.index.to_numpy())
+
+
+def test_branches_are_exercised(data):
+    n_rows = len(data)
+    stop = 3 * PAGE_SIZE
+    scan, rank = SELECTIONS['scan'](n_rows), SELECTIONS['rank'](n_rows)
+    assert stop * n_rows <= len(scan) ** 2
+    assert stop * n_rows > len(rank) ** 2
+
+
+def test_column_subset_and_past_the_end(data, grid):
+    rows = SELECTIONS['rank'](len(data))
+    window, total = grid.page(rows, 'Price', page=0, page_size=PAGE_SIZE, columns=['SKU', 'Price'])
+    assert list(window.columns) == ['SKU', 'Price']
+    empty, _ = grid.page(rows, 'Price', page=total // PAGE_SIZE + 1, page_size=PAGE_SIZE)
+    assert len(empty) == 0
+
+
+def test_selection_bitmap_is_reused(grid):
+    rows = SELECTIONS['scan'](len(grid.data))
+    bits = grid.selection_bits(rows, key='reused')
+    assert grid.selection_bits(rows, key='reused') is bits
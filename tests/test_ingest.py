@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import synthetic
+from dashboard.cube import CubeLayout
+from dashboard.ingest import DatasetStore, conform
+from dashboard.schema import apply_schema
+
+
+def make_store(n_rows=400, seed=1):
+    return DatasetStore(apply_schema(synthetic.generate(n_rows, seed=seed)))
+
+
+def incoming_rows(skus, seed=2):
+    frame = synthetic.generate(len(skus), seed=seed)
+    frame['SKU'] = skus
+    return frame
+
+
+# The store's running cube must match a full recompute over its data
+def assert_cube_matches(snapshot):
+    data = snapshot.data
+    expected = CubeLayout(data).aggregate(data)
+    cube = snapshot.cube
+    layout = cube.layout
+    assert cube.n_rows == expected.n_rows == len(data)
+    for measure in layout.measures:
+        assert cube.total(measure) == pytest.approx(expected.total(measure))
+        assert cube.mean(measure) == pytest.approx(expected.mean(measure), nan_ok=True)
+    for dim in layout.dimensions:
+        for how in ('sum', 'mean'):
+            actual = cube.rollup(dim, layout.measures, how=how).set_index(dim).sort_index()
+            reference = expected.rollup(dim, layout.measures, how=how).set_index(dim).sort_index()
+            pd.testing.assert_frame_equal(actual, reference, check_dtype=False, check_index_type=False)
+
+
+def test_changed_and_added_rows():
+    store = make_store()
+    skus = [f"SKU{i}" for i in range(0, 40, 2)] + [f"NEW{i}" for i in range(15)]
+    assert store.upsert(incoming_rows(skus)) == (15, 20)
+    snapshot = store.snapshot()
+    assert snapshot.version == 1
+    assert len(snapshot.data) == 415
+    assert_cube_matches(snapshot)
+
+    merged = snapshot.data.set_index('SKU')
+    incoming = incoming_rows(skus).set_index('SKU')
+    np.testing.assert_allclose(merged.loc[skus, 'Revenue generated'], incoming['Revenue generated'])
+
+
+def test_new_levels_rebuild_the_layout():
+    store = make_store()
+    rows = incoming_rows(['SKU3', 'NEW1'])
+    rows['Location'] = ['Pune', 'Jaipur']
+    store.upsert(rows)
+    snapshot = store.snapshot()
+    assert {'Pune', 'Jaipur'} <= set(snapshot.cube.rollup('Location', ['Order quantities'])['Location'])
+    assert_cube_matches(snapshot)
+
+
+def test_integer_overflow_widens_the_column():
+    store = make_store()
+    assert store.snapshot().data['Stock levels'].dtype == np.int8
+    rows = incoming_rows(['SKU5', 'NEW1'])
+    rows['Stock levels'] = [10_000, 40_000]
+    store.upsert(rows)
+    snapshot = store.snapshot()
+    stock = snapshot.data.set_index('SKU')['Stock levels']
+    assert stock['SKU5'] == 10_000 and stock['NEW1'] == 40_000
+    assert_cube_matches(snapshot)
+
+
+def test_missing_values():
+    store = make_store()
+    rows = incoming_rows(['SKU7', 'NEW1', 'NEW2'])
+    rows['Price'] = [np.nan, 5.0, np.nan]
+    rows['Order quantities'] = [np.nan, 3, np.nan]
+    rows['Routes'] = [None, 'Route A', None]
+    store.upsert(rows)
+    snapshot = store.snapshot()
+    assert snapshot.data['Order quantities'].isna().sum() == 2
+    assert_cube_matches(snapshot)
+
+
+def test_unchanged_rows_are_not_deltas():
+    store = make_store()
+    before = store.snapshot()
+    resent = before.data.iloc[10:30].drop(columns='Profit Margin (%)').astype(object)
+    assert store.upsert(resent) == (0, 0)
+    assert store.snapshot() is before
+
+
+def test_repeated_upserts_keep_the_cube_exact():
+    store = make_store()
+    for seed in range(3, 8):
+        skus = [f"SKU{i}" for i in range(seed, 400, 17)] + [f"NEW{seed}-{i}" for i in range(5)]
+        store.upsert(incoming_rows(skus, seed=seed))
+    assert store.snapshot().version == 5
+    assert_cube_matches(store.snapshot())
+
+
+def test_conform_rejects_missing_columns():
+    data = make_store().snapshot().data
+    with pytest.raises(ValueError, match="missing columns"):
+        conform(pd.DataFrame({'SKU': ['SKU1'], 'Price': [1.0]}), data)
+
+
+def test_bad_drop_file_is_recorded_not_raised(tmp_path):
+    store = make_store()
+    (tmp_path / 'bad.csv').write_text("SKU,Price\nSKU1,3\n")
+    assert store.poll(str(tmp_path), min_interval=0.0) == (0, 0)
+    assert 'missing columns' in store.failures[str(tmp_path / 'bad.csv')]
+    assert store.poll(str(tmp_path), min_interval=0.0) == (0, 0)
+
+    incoming_rows(['NEW1']).to_csv(tmp_path / 'good.csv', index=False)
+    assert store.poll(str(tmp_path), min_interval=0.0) == (1, 0)
+    assert_cube_matches(store.snapshot())
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import synthetic
+from dashboard.logistics import LANE_DIMENSIONS, group_quantiles, lane_summary, pareto_frontier
+from dashboard.schema import apply_schema
+
+
+@pytest.fixture(scope='module')
+def data():
+    df = apply_schema(synthetic.generate(4_000, seed=7))
+    df['Lead times'] = df['Lead times'].astype(np.float64)
+    df.loc[df.index[::17], 'Lead times'] = np.nan
+    df.loc[df.index[::23], 'Routes'] = np.nan
+    return df
+
+
+# Points no other point beats on both cost and time (within the same group)
+def brute_force_frontier(cost, time, groups):
+    frontier = np.zeros(len(cost), dtype=bool)
+    for i in range(len(cost)):
+        if np.isnan(cost[i]) or np.isnan(time[i]):
+            continue
+        same = (groups == groups[i]) & ~np.isnan(cost) & ~np.isnan(time)
+        dominated = same & (cost <= cost[i]) & (time <= time[i]) & ((cost < cost[i]) | (time < time[i]))
+        frontier[i] = not dominated.any()
+    return frontier
+
+
+def test_lane_summary_matches_groupby(data):
+    rows = np.flatnonzero((data['Product type'] != 'haircare').to_numpy())
+    summary = lane_summary(data, rows).set_index(LANE_DIMENSIONS).sort_index()
+    selected = data.take(rows)
+    grouped = selected.groupby(LANE_DIMENSIONS, observed=True, dropna=False)
+    expected = pd.DataFrame({
+        'Shipments': grouped.size(),
+        'Units': grouped['Order quantities'].sum(),
+        'Shipping cost per unit': grouped['Shipping costs'].sum() / grouped['Order quantities'].sum(),
+        'Cost per unit': grouped['Costs'].sum() / grouped['Order quantities'].sum(),
+        'Mean shipping time': grouped['Shipping times'].mean(),
+        'Mean lead time': grouped['Lead times'].mean(),
+        'Lead time p50': grouped['Lead times'].quantile(0.5),
+        'Lead time p90': grouped['Lead times'].quantile(0.9),
+    }).sort_index()
+
+    assert len(summary) == len(expected)
+    assert summary['Shipments'].sum() == len(rows)
+    for column in expected.columns:
+        np.testing.assert_allclose(
+            summary[column].to_numpy(dtype=np.float64), expected[column].to_numpy(dtype=np.float64),
+            rtol=1e-5, equal_nan=True, err_msg=column,
+        )
+
+
+def test_group_quantiles_match_numpy():
+    rng = np.random.default_rng(0)
+    groups = rng.integers(0, 6, 500)
+    values = rng.normal(size=500)
+    values[::9] = np.nan
+    result = group_quantiles(groups, values, 7, {'p25': 0.25, 'p90': 0.9})
+    for group in range(7):
+        members = values[(groups == group) & ~np.isnan(values)]
+        if len(members):
+            assert result['p25'][group] == pytest.approx(np.quantile(members, 0.25))
+            assert result['p90'][group] == pytest.approx(np.quantile(members, 0.9))
+        else:
+            assert np.isnan(result['p25'][group])
+
+
+def test_pareto_frontier_matches_brute_force():
+    rng = np.random.default_rng(1)
+    cost = rng.integers(0, 30, 400).astype(np.float64)  # integers make ties likely
+    time = rng.integers(0, 30, 400).astype(np.float64)
+    cost[::31] = np.nan
+    groups = rng.integers(0, 5, 400)
+    np.testing.assert_array_equal(pareto_frontier(cost, time, groups), brute_force_frontier(cost, time, groups))
+    np.testing.assert_array_equal(pareto_frontier(cost, time), brute_force_frontier(cost, time, np.zeros(400)))
+
+
+def test_lane_frontier_flags(data):
+    summary = lane_summary(data)
+    cost = summary['Shipping cost per unit'].to_numpy()
+    time = summary['Mean shipping time'].to_numpy()
+    supplier = np.asarray(summary['Supplier name'].cat.codes)
+    np.testing.assert_array_equal(summary['Pareto'], brute_force_frontier(cost, time, np.zeros(len(summary))))
+    np.testing.assert_array_equal(summary['Pareto within supplier'], brute_force_frontier(cost, time, supplier))